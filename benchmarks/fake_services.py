@@ -0,0 +1,366 @@
+"""
+Local stand-ins for Groq, Tavily and EuropePMC
+----------------------------------------------
+A single threaded HTTP server that speaks just enough of each provider's
+API for ChatGroq, TavilySearch and research_agent to work unchanged.
+Each service has its own configurable latency so slow-provider scenarios
+can be reproduced offline.
+
+Every news item and paper gets its own text, so the dedup stage sees a
+realistic mix, plus deliberate duplicates: every DUPLICATE_EVERY-th item
+repeats the one before it (news: same story under another URL, caught as
+a near-duplicate; papers: same DOI/PMID, caught by identity key).
+
+Run standalone:
+    python -m benchmarks.fake_services --port 8765 --groq-latency 0.5
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+DEFAULT_LATENCY = {
+    "groq": 0.4,
+    "tavily": 0.8,
+    "europepmc": 0.6,
+}
+
+ANSWER_PARAGRAPH = (
+    "Based on the available information, the most likely conditions include "
+    "the ones listed below. Common symptoms are fatigue, fever and localized "
+    "pain, and first-line treatments usually combine rest, hydration and "
+    "targeted medication. Please consult a healthcare professional for an "
+    "accurate diagnosis and a personalised treatment plan."
+)
+
+# Every DUPLICATE_EVERY-th news item / paper repeats the previous one
+DUPLICATE_EVERY = 4
+
+NEWS_SENTENCES = [
+    [
+        "Health officials in {place} issued updated guidance on {topic} this week.",
+        "A regional hospital network in {place} reported a rise in {topic} admissions.",
+        "Researchers at a university in {place} presented new data on {topic}.",
+        "A national health agency in {place} opened a consultation on {topic} care.",
+        "Clinicians in {place} are piloting a screening programme for {topic}.",
+        "An advocacy group in {place} launched an awareness campaign about {topic}.",
+    ],
+    [
+        "The update follows a review of {n} cases collected since {year}.",
+        "Early figures suggest waiting times fell by {pct}% over the last quarter.",
+        "About {n} patients took part in the first phase of the programme.",
+        "Officials said funding of {n} million would be spread over {k} years.",
+        "The analysis covered {k} regions and more than {n} clinic visits.",
+        "Uptake reached {pct}% among eligible adults within {k} months.",
+    ],
+    [
+        "Doctors stressed that symptoms such as {symptom} should not be ignored.",
+        "Pharmacists expect demand for {drug} to increase as a result.",
+        "Specialists recommended that patients with {symptom} seek early review.",
+        "The guidance also clarifies when {drug} should be offered first.",
+        "Critics questioned whether the changes go far enough for rural areas.",
+        "Patient groups welcomed the move but asked for clearer timelines.",
+    ],
+    [
+        "Further results are expected in {year}.",
+        "A follow-up report will be published after {k} months.",
+        "The agency said it would revisit the recommendations next year.",
+        "Local clinics will receive training materials in the coming weeks.",
+        "Independent experts will audit the programme at the end of {year}.",
+        "More details are available from the agency's website.",
+    ],
+]
+
+ABSTRACT_SENTENCES = [
+    [
+        "Background: {topic} remains a leading cause of morbidity in {population}.",
+        "Background: Evidence on long-term outcomes of {topic} in {population} is limited.",
+        "Background: Management of {topic} varies widely between centres.",
+        "Background: Little is known about how {symptom} predicts {topic} progression.",
+    ],
+    [
+        "Methods: We conducted a {design} of {n} {population} followed for {k} months.",
+        "Methods: This {design} enrolled {n} participants across {k} sites.",
+        "Methods: We pooled {k} cohorts ({n} patients) in a {design}.",
+        "Methods: Data from {n} electronic health records were analysed in a {design}.",
+    ],
+    [
+        "Results: {drug} reduced hospitalisation (HR 0.{hr}, 95% CI 0.{lo}-0.{hi}).",
+        "Results: {symptom} was associated with a {pct}% higher risk of readmission.",
+        "Results: Quality-of-life scores improved by {k} points with {drug}.",
+        "Results: Mortality at one year was {pct}% and did not differ between groups.",
+        "Results: Adherence to {drug} was {pct}% and adverse events were mild.",
+    ],
+    [
+        "Conclusions: {drug} should be considered earlier in {topic} care.",
+        "Conclusions: Routine screening for {symptom} may improve outcomes.",
+        "Conclusions: Larger randomised trials are needed before changing practice.",
+        "Conclusions: These findings support current guidelines for {topic}.",
+    ],
+]
+
+FILLERS = {
+    "place": ["Ontario", "Bavaria", "Kerala", "Victoria", "Lombardy", "Texas", "Osaka", "Leinster"],
+    "symptom": ["chest pain", "persistent cough", "fatigue", "weight loss", "dizziness", "night sweats"],
+    "drug": ["metformin", "an SGLT2 inhibitor", "low-dose aspirin", "a beta blocker", "a statin", "inhaled corticosteroids"],
+    "population": ["older adults", "children", "pregnant women", "adults with obesity", "veterans", "outpatients"],
+    "design": ["prospective cohort study", "randomised controlled trial", "retrospective cohort study", "case-control study"],
+}
+
+
+def fake_text(templates, topic, seed):
+    """One sentence per slot, filled from FILLERS; the same seed gives the same text."""
+    rng = random.Random(seed)
+    values = {key: rng.choice(options) for key, options in FILLERS.items()}
+    values.update(
+        topic=topic or "the condition",
+        n=rng.randint(40, 9000), k=rng.randint(2, 36), pct=rng.randint(3, 60),
+        year=rng.randint(2018, 2026), hr=rng.randint(55, 95), lo=rng.randint(40, 54), hi=rng.randint(96, 99),
+    )
+    return " ".join(rng.choice(slot).format(**values) for slot in templates)
+
+
+def item_seed(service, query, i):
+    """Stable per item; a planted duplicate reuses the seed of the item it copies."""
+    if DUPLICATE_EVERY and i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1:
+        i -= 1
+    return zlib.crc32(f"{service}:{query}:{i}".encode())
+
+
+def groq_payload(body):
+    """OpenAI-compatible chat completion, as returned by Groq."""
+    model = body.get("model", "llama-3.1-8b-instant")
+    content = "\n\n".join([ANSWER_PARAGRAPH] * 4)
+    return {
+        "id": f"chatcmpl-fake-{random.randint(0, 1_000_000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "logprobs": None,
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": 900,
+            "completion_tokens": 320,
+            "total_tokens": 1220,
+        },
+    }
+
+
+def tavily_payload(body):
+    """Tavily /search response with five news-style results."""
+    query = body.get("query", "")
+    count = int(body.get("max_results") or 5)
+    results = []
+    for i in range(count):
+        seed = item_seed("tavily", query, i)
+        results.append({
+            "title": f"{query.title()} - medical news update #{seed % 1000}",
+            # A duplicate is the same story syndicated under another URL
+            "url": f"https://news.example.org/{i + 1}",
+            "content": fake_text(NEWS_SENTENCES, query, seed),
+            "score": round(0.95 - i * 0.07, 3),
+            "raw_content": None,
+        })
+    return {
+        "query": query,
+        "follow_up_questions": None,
+        "answer": None,
+        "images": [],
+        "results": results,
+        "response_time": 0.0,
+    }
+
+
+def europepmc_payload(params):
+    """EuropePMC REST search response; honours pageSize, cursorMark and resultType."""
+    query = params.get("query", [""])[0]
+    page_size = int(params.get("pageSize", ["25"])[0])
+    result_type = params.get("resultType", ["lite"])[0]
+    cursor = params.get("cursorMark", ["*"])[0]
+    page = 0 if cursor == "*" else int(cursor.rsplit("-", 1)[-1])
+    papers = []
+    for n in range(page_size):
+        i = page * page_size + n
+        # A duplicate is the same paper (same PMID/DOI) listed twice
+        j = i - 1 if DUPLICATE_EVERY and i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1 else i
+        paper = {
+            "id": str(38000000 + j),
+            "source": "MED",
+            "pmid": str(38000000 + j),
+            "doi": f"10.1000/fake.{j + 1}",
+            "title": f"Outcomes of {query} in a multi-centre cohort (study {j + 1})",
+            "authorString": "Smith J, Doe A, Patel R, Garcia M.",
+            "journalTitle": "Journal of Clinical Medicine",
+            "pubYear": str(2025 - j % 3),
+            "isOpenAccess": "Y",
+            "citedByCount": max(0, 12 - j),
+        }
+        if result_type == "core":
+            paper["abstractText"] = fake_text(ABSTRACT_SENTENCES, query, item_seed("europepmc", query, i))
+        papers.append(paper)
+    return {
+        "version": "6.9",
+        "hitCount": 1000,
+        "nextCursorMark": f"AoIIQ/fake-{page + 1}",
+        "request": {"queryString": query, "resultType": result_type, "pageSize": page_size},
+        "resultList": {"result": papers},
+    }
+
+
+def make_handler(latency, jitter):
+    """Build a request handler bound to the given latency settings."""
+
+    class FakeServiceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _sleep(self, service):
+            delay = latency.get(service, 0.0)
+            if jitter:
+                delay *= random.uniform(1 - jitter, 1 + jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length) if length else b"{}"
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return {}
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            body = self._read_json()
+
+            if path.endswith("/chat/completions"):
+                self._sleep("groq")
+                self._send_json(groq_payload(body))
+            elif path.endswith("/search"):
+                self._sleep("tavily")
+                self._send_json(tavily_payload(body))
+            else:
+                self._send_json({"error": f"unknown path {path}"}, status=404)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+
+            if parsed.path.endswith("/europepmc/webservices/rest/search"):
+                self._sleep("europepmc")
+                self._send_json(europepmc_payload(parse_qs(parsed.query)))
+            elif parsed.path == "/health":
+                self._send_json({"status": "ok"})
+            else:
+                self._send_json({"error": f"unknown path {parsed.path}"}, status=404)
+
+    return FakeServiceHandler
+
+
+class FakeServices:
+    """
+    Runs the stand-in server on a background thread.
+
+    Usage:
+        with FakeServices(latency={"groq": 0.2}) as fake:
+            fake.apply_env()
+            ...
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None, jitter=0.1):
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.latency, jitter))
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment variables that point the app at this server."""
+        return {
+            "GROQ_API_BASE": self.base_url,
+            "GROQ_API_KEY": "fake-groq-key",
+            "TAVILY_API_BASE_URL": self.base_url,
+            "TAVILY_API_KEY": "fake-tavily-key",
+            "EUROPEPMC_URL": f"{self.base_url}/europepmc/webservices/rest/search",
+        }
+
+    def apply_env(self):
+        """
+        Export env() into os.environ. Must run before src.config.settings
+        is first imported, since settings are read at import time.
+        """
+        import os
+        os.environ.update(self.env())
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Groq/Tavily/EuropePMC server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--groq-latency", type=float, default=DEFAULT_LATENCY["groq"])
+    parser.add_argument("--tavily-latency", type=float, default=DEFAULT_LATENCY["tavily"])
+    parser.add_argument("--europepmc-latency", type=float, default=DEFAULT_LATENCY["europepmc"])
+    parser.add_argument("--jitter", type=float, default=0.1, help="Relative latency jitter (0.1 = ±10%%)")
+    args = parser.parse_args()
+
+    fake = FakeServices(
+        host=args.host,
+        port=args.port,
+        latency={
+            "groq": args.groq_latency,
+            "tavily": args.tavily_latency,
+            "europepmc": args.europepmc_latency,
+        },
+        jitter=args.jitter,
+    )
+
+    print(f"🧪 Fake services listening on {fake.base_url}")
+    for key, value in fake.env().items():
+        print(f"   export {key}={value}")
+
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping fake services")
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
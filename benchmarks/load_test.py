@@ -0,0 +1,251 @@
+"""
+End-to-end load test
+--------------------
+Drives graph.invoke (or the Flask /chat endpoint) at a fixed concurrency
+against the local stand-ins in benchmarks/fake_services.py and reports
+throughput, latency percentiles and per-node timings for every route.
+
+Every request of a route sends the same query, so request coalescing is
+off unless --coalesce is given; otherwise concurrent requests would share
+provider calls (and, on the flask target, whole graph runs) and the numbers
+would not be the cost of a request.
+
+Examples:
+    python -m benchmarks.load_test --target graph --concurrency 8 --requests 200
+    python -m benchmarks.load_test --target flask --routes rag,multi_rag_research
+    python -m benchmarks.load_test --stub-retrieval --json bench_output.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fake_services import FakeServices, DEFAULT_LATENCY
+
+
+# One representative query per decider route (see src/langgraph/nodes/decider.py)
+ROUTE_QUERIES = {
+    "rag": "I have a persistent headache and fatigue",
+    "research": "clinical trial papers on alzheimer's",
+    "websearch": "latest covid guideline announcement",
+    "multi_rag_research": "I have diabetes and want research papers",
+    "multi_rag_websearch": "asthma treatment options and latest news",
+    "multi_research_websearch": "cancer immunotherapy research and latest updates",
+}
+
+STUB_ROWS = [
+    "Disease: Migraine\nSymptoms: headache, nausea, light sensitivity\nTreatments: triptans, rest",
+    "Disease: Tension headache\nSymptoms: headache, neck pain, fatigue\nTreatments: analgesics, stress management",
+    "Disease: Anemia\nSymptoms: fatigue, pallor, shortness of breath\nTreatments: iron supplements, diet",
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies):
+    return {
+        "count": len(latencies),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else 0.0,
+    }
+
+
+def install_retrieval_stub(latency):
+    """Replace FAISS retrieval with canned rows so the run needs no model download."""
+    import src.tools.rag.retriever as retriever_module
+
+    def stub_retrieve(query, k=3):
+        time.sleep(latency)
+        return STUB_ROWS[:k]
+
+    retriever_module.retrieve_semantic_results = stub_retrieve
+
+
+def make_graph_runner(warm_retriever=True):
+    from src.service import get_service
+
+    service = get_service(warm_retriever=warm_retriever).start()
+
+    def run(query):
+        result, timings = service.invoke_with_timings(query)
+        return result.get("tool", "unknown"), timings
+
+    return run
+
+
+def make_flask_runner():
+    from web.app import app
+
+    client = app.test_client()
+
+    def run(query):
+        response = client.post("/chat", json={"query": query})
+        if response.status_code != 200:
+            raise RuntimeError(f"/chat returned {response.status_code}")
+        return response.get_json().get("tool_used", "unknown"), []
+
+    return run
+
+
+def run_route(runner, route, query, total, concurrency):
+    """Fire `total` requests for one route and collect measurements."""
+    latencies = []
+    node_times = defaultdict(list)
+    errors = 0
+    tools_used = defaultdict(int)
+
+    def one_request(_):
+        start = time.perf_counter()
+        tool, timings = runner(query)
+        return time.perf_counter() - start, tool, timings
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one_request, i) for i in range(total)]
+        for future in futures:
+            try:
+                elapsed, tool, timings = future.result()
+            except Exception as e:
+                print(f"   ❌ {route}: {e}")
+                errors += 1
+                continue
+            latencies.append(elapsed)
+            tools_used[tool] += 1
+            for node_name, seconds in timings:
+                node_times[node_name].append(seconds)
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "route": route,
+        "query": query,
+        "requests": total,
+        "errors": errors,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "latency": summarize(latencies),
+        "nodes": {name: summarize(values) for name, values in node_times.items()},
+        "tools_used": dict(tools_used),
+    }
+
+
+def print_report(report):
+    print(f"\n{'=' * 78}")
+    print(f"📊 LOAD TEST — target={report['target']} concurrency={report['concurrency']}"
+          f" coalesce={report['coalesce']}")
+    print(f"{'=' * 78}")
+    print(f"{'route':<28}{'rps':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'errors':>8}")
+    for route in report["routes"]:
+        lat = route["latency"]
+        print(f"{route['route']:<28}{route['throughput_rps']:>8.2f}"
+              f"{lat['p50']:>9.3f}{lat['p90']:>9.3f}{lat['p99']:>9.3f}{route['errors']:>8}")
+
+    for route in report["routes"]:
+        if not route["nodes"]:
+            continue
+        print(f"\n   {route['route']} — per-node (seconds)")
+        for name, stats in route["nodes"].items():
+            print(f"      {name:<18} mean={stats['mean']:.3f}  p90={stats['p90']:.3f}  p99={stats['p99']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end load test")
+    parser.add_argument("--target", choices=["graph", "flask"], default="graph")
+    parser.add_argument("--routes", default=",".join(ROUTE_QUERIES),
+                        help="Comma-separated subset of: " + ", ".join(ROUTE_QUERIES))
+    parser.add_argument("--requests", type=int, default=50, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--groq-latency", type=float, default=DEFAULT_LATENCY["groq"])
+    parser.add_argument("--tavily-latency", type=float, default=DEFAULT_LATENCY["tavily"])
+    parser.add_argument("--europepmc-latency", type=float, default=DEFAULT_LATENCY["europepmc"])
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--stub-retrieval", action="store_true",
+                        help="Skip the embedder/FAISS index and return canned rows")
+    parser.add_argument("--retrieval-latency", type=float, default=0.02,
+                        help="Latency of the retrieval stub in seconds")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start RAG retrieval in parallel with the decider")
+    parser.add_argument("--coalesce", action="store_true",
+                        help="Let identical concurrent requests share provider calls and graph runs")
+    parser.add_argument("--provider-quotas", action="store_true",
+                        help="Keep the real per-provider rate limits instead of lifting them")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    unknown = [r for r in routes if r not in ROUTE_QUERIES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    fake = FakeServices(
+        latency={
+            "groq": args.groq_latency,
+            "tavily": args.tavily_latency,
+            "europepmc": args.europepmc_latency,
+        },
+        jitter=args.jitter,
+    ).start()
+    # Settings are read at import time, so point them at the fakes first
+    fake.apply_env()
+    if not args.provider_quotas:
+        # The fakes have no quota; measure the pipeline, not the token buckets
+        for provider in ("GROQ", "TAVILY", "EUROPEPMC"):
+            os.environ.setdefault(f"{provider}_RATE_LIMIT", "1000")
+            os.environ.setdefault(f"{provider}_BURST", "1000")
+        os.environ.setdefault("MAX_INFLIGHT_REQUESTS", str(args.concurrency))
+    os.environ["COALESCE_REQUESTS"] = "true" if args.coalesce else "false"
+    if args.speculative:
+        os.environ["SPECULATIVE_RETRIEVAL"] = "true"
+    print(f"🧪 Fake services on {fake.base_url}")
+
+    try:
+        if args.stub_retrieval:
+            install_retrieval_stub(args.retrieval_latency)
+
+        if args.target == "graph":
+            runner = make_graph_runner(warm_retriever=not args.stub_retrieval)
+        else:
+            runner = make_flask_runner()
+
+        # Warm-up request so one-off setup does not skew the first route
+        runner(ROUTE_QUERIES[routes[0]])
+
+        report = {
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "coalesce": args.coalesce,
+            "latency_config": fake.latency,
+            "routes": [
+                run_route(runner, route, ROUTE_QUERIES[route], args.requests, args.concurrency)
+                for route in routes
+            ],
+        }
+    finally:
+        fake.stop()
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Gunicorn memory report (Linux)
+------------------------------
+Starts gunicorn with and without PRELOAD_MODELS, waits until every worker
+has warmed up, and compares per-worker memory from /proc/<pid>/smaps_rollup:
+
+    RSS  resident pages, shared ones counted in full for every process
+    PSS  shared pages split between the processes that map them
+    USS  pages private to the process (what a worker really costs)
+
+Examples:
+    python -m benchmarks.memory_report --workers 2
+    python -m benchmarks.memory_report --modes preload,preload+mmap --json memory.json
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = {
+    "baseline": {"PRELOAD_MODELS": "false", "FAISS_MMAP": "false"},
+    "preload": {"PRELOAD_MODELS": "true", "FAISS_MMAP": "false"},
+    "preload+mmap": {"PRELOAD_MODELS": "true", "FAISS_MMAP": "true"},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def smaps_rollup(pid):
+    """Memory counters for one process, in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "rss_mb": round(fields.get("Rss", 0), 1),
+        "pss_mb": round(fields.get("Pss", 0), 1),
+        "uss_mb": round(private, 1),
+        "shared_mb": round(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0), 1),
+    }
+
+
+def child_pids(pid):
+    pids = []
+    task_dir = f"/proc/{pid}/task"
+    for tid in os.listdir(task_dir):
+        with open(f"{task_dir}/{tid}/children") as f:
+            pids.extend(int(p) for p in f.read().split())
+    return pids
+
+
+def wait_until_ready(port, workers, timeout):
+    """Poll /health until enough distinct worker responses report warm-up finished."""
+    deadline = time.monotonic() + timeout
+    settled = set()
+    while time.monotonic() < deadline:
+        try:
+            health = requests.get(f"http://127.0.0.1:{port}/health", timeout=2).json()
+            states = health.get("components", {}).values()
+            if all(state not in ("pending", "loading") for state in states):
+                settled.add(health.get("pid"))
+                if len(settled) >= workers:
+                    return health
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("workers did not become ready in time")
+
+
+def measure(mode, workers, timeout, settle):
+    port = free_port()
+    # WEB_CONCURRENCY, not --workers, so the app splits provider quotas to match
+    env = {**os.environ, **MODES[mode], "PORT": str(port), "WEB_CONCURRENCY": str(workers)}
+    cmd = [
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+        "--bind", f"127.0.0.1:{port}", "web.app:app",
+    ]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        health = wait_until_ready(port, workers, timeout)
+        # Let lazily-touched pages settle and make sure every worker served a request
+        for _ in range(workers * 4):
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=5)
+        time.sleep(settle)
+
+        master = smaps_rollup(proc.pid)
+        worker_stats = [smaps_rollup(pid) for pid in child_pids(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    total_pss = master["pss_mb"] + sum(w["pss_mb"] for w in worker_stats)
+    return {
+        "mode": mode,
+        "components": health.get("components"),
+        "master": master,
+        "workers": worker_stats,
+        "total_pss_mb": round(total_pss, 1),
+    }
+
+
+def print_report(results):
+    print(f"\n{'=' * 72}")
+    print("🧠 MEMORY REPORT (MB)")
+    print(f"{'=' * 72}")
+    print(f"{'mode':<16}{'process':<12}{'RSS':>10}{'PSS':>10}{'USS':>10}{'shared':>10}")
+    for result in results:
+        rows = [("master", result["master"])] + [
+            (f"worker {i + 1}", stats) for i, stats in enumerate(result["workers"])
+        ]
+        for name, stats in rows:
+            print(f"{result['mode']:<16}{name:<12}{stats['rss_mb']:>10}{stats['pss_mb']:>10}"
+                  f"{stats['uss_mb']:>10}{stats['shared_mb']:>10}")
+        print(f"{result['mode']:<16}{'total PSS':<12}{result['total_pss_mb']:>20}")
+        print(f"   components: {result['components']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gunicorn worker memory with/without preload")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", default="baseline,preload", help=", ".join(MODES))
+    parser.add_argument("--timeout", type=float, default=180, help="Seconds to wait for warm-up")
+    parser.add_argument("--settle", type=float, default=2.0)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        parser.error("needs Linux /proc/<pid>/smaps_rollup")
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode not in MODES:
+            parser.error(f"unknown mode: {mode}")
+        print(f"🔄 Measuring {mode}...")
+        results.append(measure(mode, args.workers, args.timeout, args.settle))
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Rerank funnel benchmark
+-----------------------
+Compares what reaches the RAG prompt with and without the reranking stage:
+
+    dense     FAISS top-n (the old behaviour)
+    <method>  FAISS top-candidates, reranked down to top-n
+
+For each variant it reports the extra latency (wider search + rerank) and
+the quality of the prompt context on the labeled query set: hit rate
+within the top-n rows and MRR. The prompt context is what the LLM answers
+from, so a hit there is the proxy for answer quality.
+
+Examples:
+    python -m benchmarks.rerank_bench
+    python -m benchmarks.rerank_bench --methods lexical,cross-encoder --candidates 50 --top-n 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.retrieval_bench import DEFAULT_INDEX, DEFAULT_QUERIES, load_labeled_queries, score_quality
+
+
+def ms(samples):
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": statistics.median(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense vs. reranked retrieval funnel")
+    parser.add_argument("--index-path", default=DEFAULT_INDEX)
+    parser.add_argument("--queries", default=DEFAULT_QUERIES)
+    parser.add_argument("--model", help="Embedding model (defaults to EMBED_MODEL)")
+    parser.add_argument("--methods", default="lexical", help="Comma-separated: lexical, cross-encoder")
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    if args.model:
+        os.environ["EMBED_MODEL"] = args.model
+
+    import numpy as np
+
+    from src.tools.rag.retriever import load_vectorstore, search_vectors
+    from src.tools.rag.reranker import rerank
+    from tools.rag.embedder import get_embedder
+
+    labeled = load_labeled_queries(args.queries)
+    embeddings = get_embedder()
+    db = load_vectorstore(embeddings, args.index_path)
+    vectors = np.asarray([embeddings.embed_query(item["query"]) for item in labeled], dtype="float32")
+
+    def search(k):
+        rows, samples = [], []
+        for i in range(len(vectors)):
+            start = time.perf_counter()
+            rows.extend(search_vectors(db, vectors[i:i + 1], k))
+            samples.append(time.perf_counter() - start)
+        return rows, samples
+
+    narrow_rows, narrow_times = search(args.top_n)
+    wide_rows, wide_times = search(args.candidates)
+
+    report = {"queries": len(labeled), "candidates": args.candidates, "top_n": args.top_n, "variants": {}}
+    report["variants"]["dense"] = {
+        "search": ms(narrow_times),
+        "rerank": None,
+        "quality": score_quality(narrow_rows, labeled, [args.top_n]),
+    }
+
+    for method in [m.strip() for m in args.methods.split(",") if m.strip()]:
+        # Warm-up (loads the cross-encoder on first use)
+        rerank(labeled[0]["query"], wide_rows[0], args.top_n, method)
+
+        reranked, rerank_times = [], []
+        for item, rows in zip(labeled, wide_rows):
+            start = time.perf_counter()
+            reranked.append(rerank(item["query"], rows, args.top_n, method))
+            rerank_times.append(time.perf_counter() - start)
+
+        report["variants"][method] = {
+            "search": ms(wide_times),
+            "rerank": ms(rerank_times),
+            "quality": score_quality(reranked, labeled, [args.top_n]),
+        }
+
+    print(f"\n{'=' * 72}")
+    print(f"🔁 RERANK FUNNEL — {len(labeled)} queries, {args.candidates} candidates → top {args.top_n}")
+    print(f"{'=' * 72}")
+    print(f"{'variant':<16}{'search p50':>12}{'rerank p50':>12}{'hit@n':>10}{'MRR':>10}")
+    for name, variant in report["variants"].items():
+        rerank_p50 = f"{variant['rerank']['p50_ms']:.2f}" if variant["rerank"] else "-"
+        quality = variant["quality"]
+        print(f"{name:<16}{variant['search']['p50_ms']:>12.3f}{rerank_p50:>12}"
+              f"{quality['recall'][str(args.top_n)]:>10.2f}{quality['mrr']:>10.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Retrieval micro-benchmark and quality check
+-------------------------------------------
+Times each stage of the FAISS path separately (cold index load, embedder
+init, query encoding, vector search at several k) and scores recall@k and
+MRR on a labeled symptom -> disease query set.
+
+A query counts as a hit when a retrieved row contains the labeled
+`expected` text. The shipped index stores empty disease names, so labels
+point at a distinctive symptom/treatment phrase instead.
+
+Examples:
+    python -m benchmarks.retrieval_bench
+    python -m benchmarks.retrieval_bench --model sentence-transformers/all-MiniLM-L6-v2 --json retrieval.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_INDEX = os.path.join(os.path.dirname(__file__), '..', 'data', 'faiss_index')
+DEFAULT_QUERIES = os.path.join(os.path.dirname(__file__), 'data', 'symptom_queries.jsonl')
+DEFAULT_KS = [1, 3, 5, 10, 20, 50]
+
+
+def load_labeled_queries(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "samples": len(ordered),
+    }
+
+
+def first_hit_rank(rows, expected):
+    """1-based rank of the first row containing the expected text, else None."""
+    needle = expected.lower()
+    for rank, row in enumerate(rows, 1):
+        if needle in row.lower():
+            return rank
+    return None
+
+
+def score_quality(ranked_rows, labeled, ks):
+    """Recall@k and MRR@max(k) given the ranked rows for each labeled query."""
+    ranks = [first_hit_rank(rows, item["expected"]) for rows, item in zip(ranked_rows, labeled)]
+    recall = {
+        str(k): sum(1 for r in ranks if r is not None and r <= k) / len(ranks)
+        for k in ks
+    }
+    mrr = statistics.fmean(1.0 / r if r else 0.0 for r in ranks)
+    misses = [item["disease"] for item, r in zip(labeled, ranks) if r is None]
+    return {"recall": recall, "mrr": mrr, "misses": misses}
+
+
+def run(index_path, labeled, ks, repeats):
+    import numpy as np
+    from src.tools.rag.retriever import load_vectorstore, search_vectors
+    from tools.rag.embedder import get_embedder
+
+    report = {"index_path": os.path.abspath(index_path), "queries": len(labeled)}
+
+    # Embedder init (includes model weights load on first call)
+    embeddings, embedder_seconds = timed(get_embedder)
+    report["embedder_init_ms"] = embedder_seconds * 1000
+    print(f"⏱️  Embedder init: {embedder_seconds * 1000:.1f} ms")
+
+    # Cold load of index + docstore
+    db, load_seconds = timed(load_vectorstore, embeddings, index_path)
+    report["index_load_ms"] = load_seconds * 1000
+    report["index_size"] = db.index.ntotal
+    report["index_dim"] = db.index.d
+    print(f"⏱️  Index load: {load_seconds * 1000:.1f} ms ({db.index.ntotal} vectors, dim {db.index.d})")
+
+    # Query encoding, one query at a time as in production
+    texts = [item["query"] for item in labeled]
+    embeddings.embed_query(texts[0])  # warm-up
+    encode_samples = []
+    vectors = []
+    for _ in range(repeats):
+        vectors = []
+        for text in texts:
+            vector, seconds = timed(embeddings.embed_query, text)
+            encode_samples.append(seconds)
+            vectors.append(vector)
+    report["encode"] = summarize(encode_samples)
+    print(f"⏱️  Query encode: {report['encode']['p50_ms']:.2f} ms p50")
+
+    # Raw FAISS search vs. the full row lookup (docstore, or parent aggregation
+    # on a multi-vector index)
+    matrix = np.asarray(vectors, dtype="float32")
+    report["search"] = {}
+    for k in ks:
+        raw_samples = []
+        full_samples = []
+        for _ in range(repeats):
+            for i, vector in enumerate(vectors):
+                _, seconds = timed(db.index.search, matrix[i:i + 1], k)
+                raw_samples.append(seconds)
+                _, seconds = timed(search_vectors, db, matrix[i:i + 1], k)
+                full_samples.append(seconds)
+        report["search"][str(k)] = {
+            "faiss": summarize(raw_samples),
+            "with_docstore": summarize(full_samples),
+        }
+        print(f"⏱️  Search k={k:<3} faiss={report['search'][str(k)]['faiss']['p50_ms']:.3f} ms  "
+              f"with rows={report['search'][str(k)]['with_docstore']['p50_ms']:.3f} ms")
+
+    # Quality on the labeled set
+    max_k = max(ks)
+    ranked_rows = search_vectors(db, matrix, max_k)
+    report["quality"] = score_quality(ranked_rows, labeled, ks)
+    recall_line = "  ".join(f"R@{k}={v:.2f}" for k, v in report["quality"]["recall"].items())
+    print(f"🎯 Quality: {recall_line}  MRR={report['quality']['mrr']:.3f}")
+    if report["quality"]["misses"]:
+        print(f"   Missed: {', '.join(report['quality']['misses'])}")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS retrieval micro-benchmark")
+    parser.add_argument("--index-path", default=DEFAULT_INDEX)
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="Labeled JSONL query set")
+    parser.add_argument("--model", help="Embedding model (defaults to EMBED_MODEL)")
+    parser.add_argument("--ks", default=",".join(str(k) for k in DEFAULT_KS))
+    parser.add_argument("--repeats", type=int, default=3, help="Timing passes over the query set")
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+
+    if args.model:
+        # Settings are read at import time
+        os.environ["EMBED_MODEL"] = args.model
+
+    ks = sorted({int(k) for k in args.ks.split(",") if k.strip()})
+    labeled = load_labeled_queries(args.queries)
+
+    print(f"\n{'=' * 60}")
+    print(f"📚 RETRIEVAL BENCHMARK — {len(labeled)} labeled queries")
+    print(f"{'=' * 60}")
+
+    report = run(args.index_path, labeled, ks, args.repeats)
+    report["model"] = os.getenv("EMBED_MODEL")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Worker startup benchmark
+------------------------
+Measures, in fresh interpreter processes, how long it takes to import
+web.app, answer the first /health, reach full readiness (graph +
+retriever warmed up) and answer the first /chat. Also lists the slowest
+modules imported by `import web.app` (via -X importtime).
+
+External services are replaced by benchmarks/fake_services.py. With
+--stub-retrieval the embedder and FAISS index are never loaded: the service
+is created without retriever warm-up before web.app is imported, so "ready"
+means the graph is built and the retriever is "skipped".
+
+Examples:
+    python -m benchmarks.startup --runs 3
+    python -m benchmarks.startup --stub-retrieval --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def child(stub_retrieval):
+    """Runs inside the measured process; prints one JSON line."""
+    process_start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+
+    from benchmarks.fake_services import FakeServices
+    fake = FakeServices(latency={"groq": 0.0, "tavily": 0.0, "europepmc": 0.0}).start()
+    fake.apply_env()
+
+    if stub_retrieval:
+        # web.app would warm the real retriever on import; own the service first
+        os.environ["WARMUP_ON_START"] = "false"
+        from src.service import get_service
+        get_service(warm_retriever=False)
+
+    import_start = time.perf_counter()
+    import web.app as web_app
+    import_done = time.perf_counter()
+
+    if stub_retrieval:
+        from benchmarks.load_test import install_retrieval_stub
+        install_retrieval_stub(0.0)
+        web_app.start_warm_up()
+
+    client = web_app.app.test_client()
+    client.get("/health")
+    health_done = time.perf_counter()
+
+    components = {}
+    while True:
+        components = client.get("/health").get_json()["components"]
+        if all(state not in ("pending", "loading") for state in components.values()):
+            break
+        time.sleep(0.01)
+    ready_done = time.perf_counter()
+
+    response = client.post("/chat", json={"query": "I have a persistent headache and fatigue"})
+    chat_done = time.perf_counter()
+    fake.stop()
+
+    print(json.dumps({
+        "import_s": import_done - import_start,
+        "first_health_s": health_done - process_start,
+        "ready_s": ready_done - process_start,
+        "first_chat_s": chat_done - process_start,
+        "first_chat_status": response.status_code,
+        "components": components,
+    }))
+
+
+def import_profile(top):
+    """Slowest modules (cumulative µs) when importing web.app."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import web.app"],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "WARMUP_ON_START": "false"},
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": us / 1000} for us, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure web worker startup")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--stub-retrieval", action="store_true",
+                        help="Answer RAG from canned rows (no embedder download)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.stub_retrieval)
+        return
+
+    runs = []
+    for i in range(args.runs):
+        cmd = [sys.executable, "-m", "benchmarks.startup", "--child"]
+        if args.stub_retrieval:
+            cmd.append("--stub-retrieval")
+        wall_start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        wall = time.perf_counter() - wall_start
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"❌ Run {i + 1} failed:\n{proc.stderr[-2000:]}")
+            continue
+        run = json.loads(lines[-1])
+        run["process_wall_s"] = wall
+        runs.append(run)
+        print(f"⏱️  Run {i + 1}: import={run['import_s']:.2f}s  health={run['first_health_s']:.2f}s  "
+              f"ready={run['ready_s']:.2f}s  first chat={run['first_chat_s']:.2f}s ({run['first_chat_status']})")
+
+    report = {"runs": runs, "slowest_imports": import_profile(args.top)}
+    if runs:
+        report["median"] = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("import_s", "first_health_s", "ready_s", "first_chat_s")
+        }
+        print(f"\n📊 Median: " + "  ".join(f"{k}={v:.2f}" for k, v in report["median"].items()))
+        print(f"   Components: {runs[-1]['components']}")
+
+    print(f"\n🐢 Slowest imports for `import web.app`:")
+    for row in report["slowest_imports"]:
+        print(f"   {row['cumulative_ms']:>9.1f} ms  {row['module']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
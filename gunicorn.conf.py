@@ -0,0 +1,61 @@
+"""
+Gunicorn configuration
+----------------------
+With PRELOAD_MODELS=true the app, LangGraph, embedder and FAISS index are
+loaded once in the master before workers fork. Workers then share those
+pages copy-on-write instead of each holding its own copy of the
+sentence-transformer weights and index.
+
+The price is startup time: gunicorn runs on_starting before it binds the
+port, so nothing (not even /health) answers until the models are loaded.
+Leave it off where the platform waits for the port (Render); there each
+worker binds at once and warms up in the background.
+
+Command-line flags (see render.yaml) override the defaults below, except
+the worker count: set it with WEB_CONCURRENCY, which the app also reads to
+split the provider quotas between workers.
+"""
+import gc
+import os
+
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "false").lower() in ("1", "true", "yes")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+# Workers import the app after this file runs; they read it to split the provider quotas
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+timeout = 120
+
+if PRELOAD_MODELS:
+    preload_app = True
+
+    # Load synchronously in the master (see on_starting), not on a thread:
+    # threads don't survive fork.
+    os.environ["WARMUP_ON_START"] = "false"
+
+    # OpenMP and HF tokenizer thread pools are not fork-safe once started
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def on_starting(server):
+    if not PRELOAD_MODELS:
+        return
+
+    from web.app import preload_models
+
+    server.log.info("Preloading graph, embedder and FAISS index in master")
+    preload_models()
+
+    # New index versions are loaded by each worker; the master only serves
+    # as the fork template and must not reload them itself.
+    import sys
+    retriever = sys.modules.get("src.tools.rag.retriever")
+    if retriever:
+        retriever.index_manager.detach_watcher()
+
+    # Move everything loaded so far out of the GC's reach so collections in
+    # workers don't touch (and un-share) those pages.
+    gc.collect()
+    gc.freeze()
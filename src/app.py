@@ -1,33 +1,28 @@
-from src.langgraph.graph import build_graph
+from src.service import get_service
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
 def main():
-    query = input("🩺 Ask your Medical AI Assistant: ")
+    # Graph and retriever are built once; every question reuses them
+    service = get_service().start()
 
-    # Build and compile the graph
-    graph = build_graph()
+    while True:
+        try:
+            query = input("🩺 Ask your Medical AI Assistant: ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            break
+        if not query:
+            break
 
-    # Initialize state with all required fields INCLUDING final_answer
-    state = {
-        "query": query,
-        "tool": "",
-        "results": [],
-        "metadata": {},
-        "final_answer": ""  # Initialize empty
-    }
+        final_answer = service.answer(query)
 
-    # Run the graph
-    result = graph.invoke(state)
-
-    # Display the final answer
-    final_answer = result.get("final_answer", "No response generated")
-
-    print("\n💬 Final Answer:\n")
-    print(final_answer)
+        print("\n💬 Final Answer:\n")
+        print(final_answer)
+        print()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,172 @@
+"""
+Batch Query Runner
+------------------
+Runs every query in a JSONL file through the graph with a shared, warmed-up
+graph/embedder/index and streams one JSON line per query to the output file,
+including the routing decision and per-node timings.
+
+Input lines:  {"id": "q1", "query": "..."}   ("id" defaults to the line number)
+
+Re-running with the same output file resumes: ids already written are
+skipped (failed ones too, unless --retry-errors). A query counts as failed
+if the graph raised, a tool reported an error notice, or the answer was
+degraded (tool skipped, out of budget). Before appending, the file is
+rewritten without a partial last line from an interrupted run and without
+the failed records about to be retried, so every id keeps one line.
+
+Usage:
+    python -m src.batch queries.jsonl results.jsonl --parallel 8
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.tools.results import notices
+
+
+def read_queries(path):
+    queries = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            queries.append({"id": str(item.get("id", line_no)), "query": item["query"]})
+    return queries
+
+
+def read_output(path):
+    """
+    (records, clean) for an existing output file: {id: record} in file order,
+    the last line winning for an id, and whether the file can be appended to
+    as it is (no unreadable lines, ends in a newline).
+    """
+    records = {}
+    clean = True
+    if not os.path.exists(path):
+        return records, clean
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Partial last line from an interrupted run
+                clean = False
+                continue
+            if not line.endswith("\n"):
+                clean = False
+            records[str(record["id"])] = record
+    return records, clean
+
+
+def completed_ids(records, retry_errors):
+    """Ids that don't need to run again."""
+    return {id_ for id_, record in records.items() if not (retry_errors and record.get("error"))}
+
+
+def rewrite_output(path, records):
+    """Replace the output file with one line per record."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        for record in records.values():
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp, path)
+
+
+def run_one(service, item):
+    start = time.perf_counter()
+    try:
+        result, timings = service.invoke_with_timings(item["query"])
+    except Exception as e:
+        return {**item, "error": str(e), "total_s": time.perf_counter() - start}
+
+    metadata = result.get("metadata", {})
+    degraded = metadata.get("degraded")
+
+    # Tools catch their own failures and report them as notices, so a run that
+    # "succeeded" can still carry an error answer; flag it so --retry-errors re-runs it
+    problems = notices(result.get("results", []))
+    if degraded:
+        problems.insert(0, f"degraded: {degraded.get('reason', 'unknown')}")
+
+    node_timings = {}
+    for node_name, seconds in timings:
+        node_timings[node_name] = node_timings.get(node_name, 0.0) + seconds
+
+    return {
+        **item,
+        "tool": result.get("tool"),
+        "tools": metadata.get("tools", [result.get("tool")]),
+        "degraded": degraded,
+        "final_answer": result.get("final_answer", ""),
+        "timings": node_timings,
+        "total_s": time.perf_counter() - start,
+        "error": "; ".join(problems) or None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the graph")
+    parser.add_argument("input", help="JSONL file with one {\"id\", \"query\"} per line")
+    parser.add_argument("output", help="JSONL file to append results to")
+    parser.add_argument("--parallel", type=int, default=4, help="Queries in flight at once")
+    parser.add_argument("--limit", type=int, help="Only run the first N pending queries")
+    parser.add_argument("--retry-errors", action="store_true", help="Re-run ids that failed before")
+    args = parser.parse_args()
+
+    queries = read_queries(args.input)
+    records, clean = read_output(args.output)
+    done = completed_ids(records, args.retry_errors)
+    pending = [item for item in queries if item["id"] not in done]
+    if args.limit:
+        pending = pending[:args.limit]
+
+    # Appending must start on a fresh line, and a retried id must not keep its old record
+    retried = {item["id"] for item in pending} & records.keys()
+    if retried or not clean:
+        for id_ in retried:
+            del records[id_]
+        rewrite_output(args.output, records)
+
+    print(f"📋 {len(queries)} queries, {len(done)} already done, {len(pending)} to run")
+    if not pending:
+        return
+
+    from src.service import get_service
+
+    service = get_service().start()
+
+    write_lock = threading.Lock()
+    finished = 0
+    failed = 0
+    start = time.perf_counter()
+
+    with open(args.output, "a") as out, ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        futures = [pool.submit(run_one, service, item) for item in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            with write_lock:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+            finished += 1
+            failed += 1 if record["error"] else 0
+            if finished % 10 == 0 or finished == len(pending):
+                rate = finished / (time.perf_counter() - start)
+                print(f"   {finished}/{len(pending)} done ({rate:.2f} q/s, {failed} failed)")
+
+    print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
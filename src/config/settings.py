@@ -3,6 +3,155 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Repository root; relative paths for generated files are resolved from here, not the
+# working directory, so every process (web, precompute, batch) uses the same files
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def project_path(path):
+    """`path` relative to PROJECT_ROOT (absolute paths are returned unchanged)."""
+    return os.path.join(PROJECT_ROOT, path)
+
+
 EMBED_MODEL = os.getenv("EMBED_MODEL")
 DATASET_NAME = os.getenv("DATASET_NAME")
 FAISS_DB_PATH = os.getenv("FAISS_DB_PATH")
+
+# External service endpoints (override to point at local stand-ins)
+EUROPEPMC_URL = os.getenv("EUROPEPMC_URL", "https://www.ebi.ac.uk/europepmc/webservices/rest/search")
+TAVILY_API_BASE_URL = os.getenv("TAVILY_API_BASE_URL")
+
+# Admission control for /chat
+MAX_INFLIGHT_REQUESTS = int(os.getenv("MAX_INFLIGHT_REQUESTS", "4"))
+MAX_QUEUED_REQUESTS = int(os.getenv("MAX_QUEUED_REQUESTS", "8"))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("QUEUE_TIMEOUT_SECONDS", "10"))
+
+# Worker processes serving the app (gunicorn.conf.py exports its worker count here);
+# each one enforces 1/WEB_CONCURRENCY of the provider quotas below
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+# Per-provider quotas for the whole deployment: rate (calls/sec), burst, max
+# concurrency, target latency (sec) for adaptive limits, and max wait for a slot (sec)
+TOOL_LIMITS = {
+    "groq": {
+        "rate": float(os.getenv("GROQ_RATE_LIMIT", "0.5")),
+        "burst": int(os.getenv("GROQ_BURST", "5")),
+        "max_concurrency": int(os.getenv("GROQ_MAX_CONCURRENCY", "4")),
+        "target_latency": float(os.getenv("GROQ_TARGET_LATENCY", "5")),
+        "max_wait": float(os.getenv("GROQ_MAX_WAIT", "10")),
+    },
+    "tavily": {
+        "rate": float(os.getenv("TAVILY_RATE_LIMIT", "1.5")),
+        "burst": int(os.getenv("TAVILY_BURST", "5")),
+        "max_concurrency": int(os.getenv("TAVILY_MAX_CONCURRENCY", "4")),
+        "target_latency": float(os.getenv("TAVILY_TARGET_LATENCY", "4")),
+        "max_wait": float(os.getenv("TAVILY_MAX_WAIT", "5")),
+    },
+    "europepmc": {
+        "rate": float(os.getenv("EUROPEPMC_RATE_LIMIT", "10")),
+        "burst": int(os.getenv("EUROPEPMC_BURST", "10")),
+        "max_concurrency": int(os.getenv("EUROPEPMC_MAX_CONCURRENCY", "4")),
+        "target_latency": float(os.getenv("EUROPEPMC_TARGET_LATENCY", "3")),
+        "max_wait": float(os.getenv("EUROPEPMC_MAX_WAIT", "5")),
+    },
+}
+
+# Circuit breakers and provider timeouts
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+EUROPEPMC_TIMEOUT = float(os.getenv("EUROPEPMC_TIMEOUT", "5"))
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "8"))
+
+# Speculative RAG retrieval while the decider routes
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() in ("1", "true", "yes")
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+
+# Web worker startup: warm up graph + retriever in the background at import,
+# and how long the first /chat waits for the graph
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() in ("1", "true", "yes")
+GRAPH_WAIT_SECONDS = float(os.getenv("GRAPH_WAIT_SECONDS", "60"))
+
+# Memory-map the FAISS vectors instead of copying them onto the heap
+FAISS_MMAP = os.getenv("FAISS_MMAP", "false").lower() in ("1", "true", "yes")
+
+# Optional standalone retrieval server (python -m src.tools.rag.retrieval_server).
+# "http://127.0.0.1:8700" or "unix:///tmp/medical-rag.sock"; unset = in-process retrieval
+RETRIEVAL_SERVER_URL = os.getenv("RETRIEVAL_SERVER_URL")
+RETRIEVAL_SERVER_TIMEOUT = float(os.getenv("RETRIEVAL_SERVER_TIMEOUT", "5"))
+RETRIEVAL_FALLBACK_LOCAL = os.getenv("RETRIEVAL_FALLBACK_LOCAL", "true").lower() in ("1", "true", "yes")
+RETRIEVAL_MAX_BATCH = int(os.getenv("RETRIEVAL_MAX_BATCH", "32"))
+RETRIEVAL_BATCH_WAIT_MS = float(os.getenv("RETRIEVAL_BATCH_WAIT_MS", "5"))
+
+# RAG retrieval funnel: FAISS candidates -> reranker -> rows in the prompt
+RAG_CANDIDATES = int(os.getenv("RAG_CANDIDATES", "50"))
+RAG_TOP_K = int(os.getenv("RAG_TOP_K", "3"))
+RERANKER = os.getenv("RERANKER", "lexical")
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+# EuropePMC result handling
+RESEARCH_MAX_PAPERS = int(os.getenv("RESEARCH_MAX_PAPERS", "5"))
+RESEARCH_ABSTRACT_CHARS = int(os.getenv("RESEARCH_ABSTRACT_CHARS", "300"))
+EUROPEPMC_MAX_BYTES = int(os.getenv("EUROPEPMC_MAX_BYTES", "1000000"))
+
+# Duplicate collapse before the aggregator: MinHash Jaccard threshold and
+# number of hash permutations (exact DOI/PMID/URL matches always collapse)
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "64"))
+
+# Single-flight: identical in-flight /chat queries and provider calls share one execution
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() in ("1", "true", "yes")
+
+# Precomputed answers for hot queries (python -m src.precompute), tied to the FAISS index version.
+# Only routes listed in PRECOMPUTE_ROUTES are stored: web and research answers go stale.
+ANSWER_STORE_PATH = project_path(os.getenv("ANSWER_STORE_PATH", "data/answer_store.db"))
+SERVE_PRECOMPUTED = os.getenv("SERVE_PRECOMPUTED", "true").lower() in ("1", "true", "yes")
+PRECOMPUTE_ROUTES = [r.strip() for r in os.getenv("PRECOMPUTE_ROUTES", "rag").split(",") if r.strip()]
+
+# Index layout: "row" = one vector per disease row; "multi" = one vector per symptom
+# group plus one for treatments, aggregated back to the parent row at query time
+INDEX_MODE = os.getenv("INDEX_MODE", "row")
+SYMPTOM_GROUP_SIZE = int(os.getenv("SYMPTOM_GROUP_SIZE", "3"))
+MULTI_VECTOR_FANOUT = int(os.getenv("MULTI_VECTOR_FANOUT", "8"))
+MULTI_VECTOR_SUM_WEIGHT = float(os.getenv("MULTI_VECTOR_SUM_WEIGHT", "0.1"))
+
+# Versioned FAISS index: how often running processes check the manifest for a new
+# version (0 = never), and how many old versions build_faiss_index keeps on disk
+INDEX_WATCH_SECONDS = float(os.getenv("INDEX_WATCH_SECONDS", "30"))
+INDEX_KEEP_VERSIONS = int(os.getenv("INDEX_KEEP_VERSIONS", "3"))
+
+# Per-request latency budget. Nodes size tool timeouts, retrieval depth, model tier
+# and max output tokens from what is left; LLM_RESERVE_SECONDS is kept for the
+# final synthesis call
+REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", "25"))
+LLM_RESERVE_SECONDS = float(os.getenv("LLM_RESERVE_SECONDS", "4"))
+RETRIEVAL_FULL_DEPTH_SECONDS = float(os.getenv("RETRIEVAL_FULL_DEPTH_SECONDS", "5"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+LLM_MIN_TOKENS = int(os.getenv("LLM_MIN_TOKENS", "128"))
+STRONG_MODEL_MIN_SECONDS = float(os.getenv("STRONG_MODEL_MIN_SECONDS", "8"))
+
+# Model tiers: "fast" for single-tool answers, "strong" for multi-tool synthesis.
+# Throughput and time-to-first-token estimates turn seconds left into max_tokens
+LLM_TIERS = {
+    "fast": {
+        "model": os.getenv("FAST_MODEL", "llama-3.1-8b-instant"),
+        "tokens_per_second": float(os.getenv("FAST_MODEL_TPS", "400")),
+        "first_token_seconds": float(os.getenv("FAST_MODEL_TTFT", "0.3")),
+    },
+    "strong": {
+        "model": os.getenv("STRONG_MODEL", "llama-3.3-70b-versatile"),
+        "tokens_per_second": float(os.getenv("STRONG_MODEL_TPS", "150")),
+        "first_token_seconds": float(os.getenv("STRONG_MODEL_TTFT", "0.6")),
+    },
+}
+
+# Opt-in request profiling: /chat requests with "X-Profile: 1" or "?profile=1" (only if
+# PROFILE_ON_REQUEST, and with "X-Profile-Token: <PROFILE_TOKEN>" when a token is set)
+# plus a random PROFILE_SAMPLE_RATE fraction of all requests are sampled every
+# PROFILE_INTERVAL_MS; folded stacks go to PROFILE_DIR/<request_id>.folded
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ON_REQUEST = os.getenv("PROFILE_ON_REQUEST", "false").lower() in ("1", "true", "yes")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = project_path(os.getenv("PROFILE_DIR", "data/profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
@@ -1,13 +1,19 @@
 """
 Updated Graph with Multi-Tool Execution Support
 """
+import time
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, END
 from src.langgraph.nodes.decider import decide_tool
 from src.langgraph.nodes.aggregator import aggregate_response
+from src.langgraph.nodes.dedup import dedup_node
 from src.tools.rag.rag_agent import rag_agent
 from src.tools.research.research_agent import research_agent
 from src.tools.websearch.websearch_tool import websearch_tool
+from src.tools.rag.prefetch import start_prefetch, discard_prefetch
+from src.config.settings import SPECULATIVE_RETRIEVAL, LLM_RESERVE_SECONDS
+from src.runtime.budget import expired, mark_degraded
+from src.runtime.admission import Overloaded
 
 
 class MyState(TypedDict):
@@ -16,11 +22,17 @@ class MyState(TypedDict):
     results: list
     metadata: dict
     final_answer: str
+    prefetch: dict
+    deadline: float
 
 
 def route_after_decider(state):
     """Route based on tool decision"""
     tool = state["tool"]
+    planned = state["metadata"].get("tools", []) if tool == "multi" else [tool]
+
+    if "rag" not in planned:
+        discard_prefetch(state)
 
     if tool == "multi":
         return "multi_executor"
@@ -40,8 +52,15 @@ def multi_executor(state):
     print(f"{'=' * 60}")
 
     all_results = []
+    metadata = state["metadata"]
+    shed = None
 
     for tool_name in tools_to_run:
+        if expired(state):
+            print(f"\n⏱️  Budget spent, skipping: {tool_name.upper()}")
+            metadata = mark_degraded(metadata, "budget", skipped=[tool_name])
+            continue
+
         print(f"\n▶️  Executing: {tool_name.upper()}")
 
         # Get tool-specific query or use original
@@ -54,7 +73,11 @@ def multi_executor(state):
             "tool": tool_name,
             "results": [],
             "metadata": {},
-            "final_answer": ""
+            "final_answer": "",
+            "prefetch": state.get("prefetch"),
+            # Tools must finish in time for the aggregator's synthesis call
+            "deadline": state["deadline"] - LLM_RESERVE_SECONDS,
+            "llm_reserved": True
         }
 
         # Execute the appropriate tool
@@ -72,23 +95,33 @@ def multi_executor(state):
             # Get results from this tool
             tool_results = result.get("results", [])
 
-            if tool_results:
-                # Add section header
-                header = f"\n{'=' * 60}\n📋 {tool_name.upper()} RESULTS\n{'=' * 60}\n"
-                all_results.append(header)
+            # Keep what the tool gave up on (e.g. its LLM call, out of budget)
+            tool_degraded = result.get("metadata", {}).get("degraded")
+            if tool_degraded:
+                metadata = mark_degraded(metadata, **tool_degraded)
 
-                # Add the actual results
+            if tool_results:
+                # Each ToolResult carries its source; the aggregator groups by it
                 all_results.extend(tool_results)
 
                 print(f"   ✅ Got {len(tool_results)} results")
             else:
                 print(f"   ⚠️  No results from {tool_name}")
 
+        except Overloaded as e:
+            print(f"   ⏳ {tool_name} shed: {e}")
+            metadata = mark_degraded(metadata, "shed", shed=[tool_name])
+            shed = e
+
         except Exception as e:
             print(f"   ❌ Error executing {tool_name}: {e}")
             import traceback
             traceback.print_exc()
 
+    # Every tool was shed: nothing to aggregate, so answer 503 rather than an empty 200
+    if shed is not None and not all_results:
+        raise shed
+
     print(f"\n{'=' * 60}")
     print(f"✅ MULTI-EXECUTOR: Combined {len(all_results)} total results")
     print(f"{'=' * 60}\n")
@@ -96,13 +129,20 @@ def multi_executor(state):
     # Return combined results
     return {
         **state,
+        "metadata": metadata,
         "results": all_results,
         "tool": "multi"  # Mark as multi for aggregator
     }
 
 
-def build_graph():
-    """Build the LangGraph workflow"""
+def build_graph(speculative=None):
+    """
+    Build the LangGraph workflow.
+    With speculative=True (default: SPECULATIVE_RETRIEVAL), a prefetch node
+    starts RAG retrieval before the decider runs.
+    """
+    if speculative is None:
+        speculative = SPECULATIVE_RETRIEVAL
 
     # Initialize graph
     graph = StateGraph(MyState)
@@ -113,10 +153,16 @@ def build_graph():
     graph.add_node("research", research_agent)
     graph.add_node("websearch", websearch_tool)
     graph.add_node("multi_executor", multi_executor)
+    graph.add_node("dedup", dedup_node)
     graph.add_node("aggregator", aggregate_response)
 
     # Set entry point
-    graph.set_entry_point("decider")
+    if speculative:
+        graph.add_node("prefetch", start_prefetch)
+        graph.set_entry_point("prefetch")
+        graph.add_edge("prefetch", "decider")
+    else:
+        graph.set_entry_point("decider")
 
     # Conditional routing from decider
     graph.add_conditional_edges(
@@ -130,11 +176,12 @@ def build_graph():
         }
     )
 
-    # All tool nodes go to aggregator
-    graph.add_edge("rag", "aggregator")
-    graph.add_edge("research", "aggregator")
-    graph.add_edge("websearch", "aggregator")
-    graph.add_edge("multi_executor", "aggregator")
+    # All tool nodes go through dedup to the aggregator
+    graph.add_edge("rag", "dedup")
+    graph.add_edge("research", "dedup")
+    graph.add_edge("websearch", "dedup")
+    graph.add_edge("multi_executor", "dedup")
+    graph.add_edge("dedup", "aggregator")
 
     # Aggregator goes to END
     graph.add_edge("aggregator", END)
@@ -143,4 +190,24 @@ def build_graph():
     compiled = graph.compile()
     print("✅ Graph compiled successfully with multi-tool support\n")
 
-    return compiled
\ No newline at end of file
+    return compiled
+
+def invoke_with_timings(graph, state):
+    """
+    Run the graph like graph.invoke, but also measure each node.
+    Returns (final_state, timings) where timings is a list of
+    (node_name, seconds) in execution order.
+    """
+    final_state = dict(state)
+    timings = []
+
+    start = time.perf_counter()
+    for chunk in graph.stream(state, stream_mode="updates"):
+        now = time.perf_counter()
+        for node_name, update in chunk.items():
+            timings.append((node_name, now - start))
+            if update:
+                final_state.update(update)
+        start = now
+
+    return final_state, timings
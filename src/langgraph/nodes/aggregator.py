@@ -1,8 +1,10 @@
 """
 Aggregator Node - Enhanced for Multi-Tool Support
 """
-import os
-from langchain_groq import ChatGroq
+from src.runtime.singleflight import invoke_llm
+from src.runtime.budget import llm_for, mark_degraded
+from src.runtime.admission import Overloaded
+from src.tools.results import render_results
 
 
 def aggregate_response(state):
@@ -29,14 +31,17 @@ def aggregate_response(state):
     if tool == "multi":
         print(f"🔀 Aggregator: Combining multi-tool results with LLM")
 
-        llm = ChatGroq(
-            model="llama-3.1-8b-instant",
-            api_key=os.getenv("GROQ_API_KEY"),
-            temperature=0.3
-        )
-
         # Combine all results into context
-        combined_context = "\n\n".join(str(r) for r in results)
+        combined_context = render_results(results)
+
+        # Strong model for synthesis when the budget allows it
+        llm = llm_for(state, strong=True, temperature=0.3)
+        if llm is None:
+            return {
+                **state,
+                "metadata": mark_degraded(state.get("metadata"), "budget", llm_skipped=["aggregator"]),
+                "final_answer": combined_context
+            }
 
         prompt = f"""You are a medical AI assistant. The user asked: "{query}"
 
@@ -54,7 +59,7 @@ Please provide a comprehensive, well-organized response that:
 Keep your response professional, accurate, and easy to understand."""
 
         try:
-            response = llm.invoke(prompt)
+            response = invoke_llm(llm, prompt)
             final_text = response.content if hasattr(response, 'content') else str(response)
 
             print(f"✅ Aggregator: Generated {len(final_text)} char response")
@@ -64,13 +69,17 @@ Keep your response professional, accurate, and easy to understand."""
                 "final_answer": final_text
             }
 
+        except Overloaded:
+            # Shed by the Groq limiter: let /chat answer 503 with Retry-After
+            raise
+
         except Exception as e:
             print(f"❌ Aggregator LLM Error: {e}")
             # Fallback: return formatted results
-            fallback = "\n\n".join(str(r) for r in results)
             return {
                 **state,
-                "final_answer": fallback
+                "metadata": mark_degraded(state.get("metadata"), "llm error", llm_failed=["aggregator"]),
+                "final_answer": combined_context
             }
 
     # ============================================
@@ -79,21 +88,23 @@ Keep your response professional, accurate, and easy to understand."""
 
     # RAG results - already formatted, return directly
     if tool == "rag":
-        first_result = results[0] if results else ""
-        print(f"✅ Aggregator: RAG response ({len(str(first_result))} chars)")
+        first_result = render_results(results)
+        print(f"✅ Aggregator: RAG response ({len(first_result)} chars)")
         return {
             **state,
-            "final_answer": str(first_result)
+            "final_answer": first_result
         }
 
     # Research & WebSearch - Use LLM to summarize
-    llm = ChatGroq(
-        model="llama-3.1-8b-instant",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.3
-    )
+    context = render_results(results)
 
-    context = "\n\n".join(str(r) for r in results)
+    llm = llm_for(state, temperature=0.3)
+    if llm is None:
+        return {
+            **state,
+            "metadata": mark_degraded(state.get("metadata"), "budget", llm_skipped=["aggregator"]),
+            "final_answer": context
+        }
 
     if tool == "research":
         prompt = f"""Summarize these research papers for the query: "{query}"
@@ -130,7 +141,7 @@ Keep it concise and organized."""
 Provide a clear, organized summary."""
 
     try:
-        response = llm.invoke(prompt)
+        response = invoke_llm(llm, prompt)
         final_text = response.content if hasattr(response, 'content') else str(response)
 
         print(f"✅ Aggregator: Generated {len(final_text)} char response")
@@ -140,10 +151,14 @@ Provide a clear, organized summary."""
             "final_answer": final_text
         }
 
+    except Overloaded:
+        raise
+
     except Exception as e:
         print(f"❌ Aggregator Error: {e}")
         # Fallback to raw context
         return {
             **state,
+            "metadata": mark_degraded(state.get("metadata"), "llm error", llm_failed=["aggregator"]),
             "final_answer": context
         }
\ No newline at end of file
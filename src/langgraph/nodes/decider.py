@@ -1,6 +1,14 @@
+from src.runtime.breaker import tool_available, TOOL_PROVIDERS
+from src.runtime.budget import ensure_deadline
 
 
 def decide_tool(state):
+    """Pick a route for the query, then route around any tool whose circuit is open."""
+    state = detect_route(ensure_deadline(state))
+    return apply_circuit_breakers(state)
+
+
+def detect_route(state):
     query = state["query"].lower()
     original_query = state["query"]
 
@@ -154,6 +162,43 @@ def decide_tool(state):
     return state
 
 
+def apply_circuit_breakers(state):
+    """
+    Drop or substitute tools whose provider breaker is open.
+    RAG is local and is the fallback; the change is recorded in metadata["degraded"].
+    """
+    tool = state["tool"]
+    metadata = state.get("metadata") or {}
+    planned = metadata.get("tools", []) if tool == "multi" else [tool]
+    skipped = [t for t in planned if not tool_available(t)]
+
+    if not skipped:
+        return state
+
+    remaining = [t for t in planned if t not in skipped]
+    degraded = {
+        "skipped": skipped,
+        "providers": [TOOL_PROVIDERS[t] for t in skipped],
+        "reason": "circuit open",
+    }
+
+    if not remaining:
+        # Nothing left (single external tool, or research + websearch): answer from RAG
+        state["tool"] = "rag"
+        degraded["substituted"] = "rag"
+        state["metadata"] = {"degraded": degraded}
+    else:
+        # Keep the multi route with whatever is still available
+        state["metadata"] = {
+            **metadata,
+            "tools": remaining,
+            "degraded": degraded,
+        }
+
+    print(f"🔌 DEGRADED: skipped {', '.join(skipped)} → {state['tool']}")
+    return state
+
+
 def extract_topic(query):
     """Extract core medical topic from query"""
     # Remove common noise words
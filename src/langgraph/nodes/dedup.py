@@ -0,0 +1,20 @@
+"""
+Dedup Node - collapses duplicate results between the tools and the aggregator
+"""
+from src.tools.dedup import dedup_results
+
+
+def dedup_node(state):
+    """Drop results that repeat an earlier one, so the aggregator prompt stays small."""
+    results = state.get("results", [])
+    if len(results) < 2:
+        return state
+
+    kept, dropped = dedup_results(results)
+    if dropped:
+        print(f"🧹 Dedup: collapsed {dropped} duplicate result(s), {len(kept)} left")
+
+    return {
+        **state,
+        "results": kept
+    }
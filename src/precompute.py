@@ -0,0 +1,169 @@
+"""
+Precompute Answers for Hot Queries
+----------------------------------
+Runs a list of hot queries through the graph and stores the answers in the
+answer store under the current FAISS index version; /chat then serves exact
+or normalized matches without running the graph. Answers from older index
+versions are pruned first.
+
+Query sources (combine as needed):
+    --queries FILE   .txt (one query per line) or .jsonl ({"query": ...})
+    --from-index     one query per FAISS row: --template with the disease name,
+                     or --symptom-template with the row's first --symptoms
+                     symptoms when the row has no name (as in the shipped index)
+
+Only answers whose route is in PRECOMPUTE_ROUTES (default: rag) are stored,
+and never degraded or failed ones.
+
+Usage:
+    python -m src.precompute --from-index --parallel 4
+    python -m src.precompute --queries data/hot_queries.txt --force
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.config.settings import PRECOMPUTE_ROUTES
+from src.runtime.answer_store import answer_store, index_version
+from src.runtime.singleflight import normalize_query
+from src.tools.results import notices
+
+
+def read_queries(path):
+    queries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            queries.append(json.loads(line)["query"] if path.endswith(".jsonl") else line)
+    return queries
+
+
+def index_rows():
+    """(disease, symptoms, treatments) of every row in the FAISS index."""
+    from src.tools.rag.retriever import get_vectorstore
+    from src.tools.rag.multivector import ROW_FIELDS_RE, rows_from_docstore
+
+    db = get_vectorstore()
+    if db.parent_index is None:
+        return rows_from_docstore(db)
+
+    rows = []
+    for text in db.parent_index.rows:
+        match = ROW_FIELDS_RE.match(text)
+        if match:
+            rows.append(tuple(part.strip() for part in match.groups()))
+    return rows
+
+
+def index_queries(template, symptom_template, symptom_count):
+    """
+    One query per index row: `template` with the disease name, or, for rows
+    without a name, `symptom_template` with the first `symptom_count` symptoms.
+    """
+    from src.tools.rag.multivector import split_symptoms
+
+    queries = []
+    for disease, symptoms, _ in index_rows():
+        if disease:
+            queries.append(template.format(disease=disease))
+            continue
+        items = [s.lower() for s in split_symptoms(symptoms, 1)[:symptom_count]]
+        if items:
+            listed = items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
+            queries.append(symptom_template.format(symptoms=listed))
+    return queries
+
+
+def is_storable(result):
+    if result.get("tool") not in PRECOMPUTE_ROUTES:
+        return False
+    if result.get("metadata", {}).get("degraded") or not result.get("final_answer"):
+        return False
+    return not notices(result.get("results", []))
+
+
+def run_one(service, query, version):
+    try:
+        result = service.invoke(query)
+    except Exception as e:
+        print(f"❌ {query}: {e}")
+        return False
+
+    if not is_storable(result):
+        print(f"⏭️ Not stored (route '{result.get('tool')}'): {query}")
+        return False
+    answer_store.put(query, result["final_answer"], result["tool"], version)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute answers for hot queries")
+    parser.add_argument("--queries", help="Text or JSONL file of hot queries")
+    parser.add_argument("--from-index", action="store_true", help="Add one query per disease in the FAISS index")
+    parser.add_argument("--template", default="What is {disease}?", help="Query template for named rows (--from-index)")
+    parser.add_argument("--symptom-template", default="I have {symptoms}",
+                        help="Query template for rows without a disease name (--from-index)")
+    parser.add_argument("--symptoms", type=int, default=3, help="Symptoms per --symptom-template query")
+    parser.add_argument("--limit", type=int, help="Only the first N queries")
+    parser.add_argument("--parallel", type=int, default=4, help="Queries in flight at once")
+    parser.add_argument("--force", action="store_true", help="Recompute queries that already have an answer")
+    args = parser.parse_args()
+
+    version = index_version()
+    if version is None:
+        print("❌ No FAISS index found; build it first (see FAISS_DB_PATH)")
+        sys.exit(1)
+
+    queries = read_queries(args.queries) if args.queries else []
+    if args.from_index:
+        from_index = index_queries(args.template, args.symptom_template, args.symptoms)
+        if not from_index:
+            print("❌ --from-index found no disease names or symptoms in the FAISS index")
+            sys.exit(1)
+        print(f"📋 {len(from_index)} queries derived from the index")
+        queries += from_index
+
+    # One run per normalized query, keeping the first spelling
+    unique = {}
+    for query in queries:
+        unique.setdefault(normalize_query(query), query)
+    if not args.force:
+        for key in answer_store.keys(version):
+            unique.pop(key, None)
+    pending = list(unique.values())[:args.limit]
+
+    pruned = answer_store.prune(version)
+    print(f"📋 Index {version}: {len(pending)} queries to precompute, {pruned} stale answers pruned")
+    if not pending:
+        return
+
+    from src.service import get_service
+
+    service = get_service().start()
+
+    stored = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        futures = [pool.submit(run_one, service, query, version) for query in pending]
+        for finished, future in enumerate(as_completed(futures), 1):
+            stored += future.result()
+            if finished % 10 == 0 or finished == len(pending):
+                rate = finished / (time.perf_counter() - start)
+                print(f"   {finished}/{len(pending)} done ({rate:.2f} q/s, {stored} stored)")
+
+    print(f"✅ {stored} answers stored in {answer_store.path}")
+
+
+if __name__ == "__main__":
+    main()
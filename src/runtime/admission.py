@@ -0,0 +1,239 @@
+"""
+Admission Control — request queueing, rate limits and adaptive concurrency
+--------------------------------------------------------------------------
+Two layers keep bursts from overwhelming the external providers:
+
+1. AdmissionController: caps in-flight /chat requests and the number of
+   requests allowed to wait for a slot. When the queue is full, or a
+   request waits too long, it raises Overloaded so the web layer can shed
+   load with a fast 503 instead of hitting gunicorn's timeout.
+
+2. tool_slot(name): a per-provider gate (groq, tavily, europepmc) that
+   combines a token bucket sized to the provider's quota with a
+   concurrency limit that adapts to observed latency (AIMD).
+
+The quotas in TOOL_LIMITS are for the whole deployment. Buckets and limits
+live in each process, so every worker enforces 1/WEB_CONCURRENCY of them.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from src.config.settings import (
+    MAX_INFLIGHT_REQUESTS,
+    MAX_QUEUED_REQUESTS,
+    QUEUE_TIMEOUT_SECONDS,
+    TOOL_LIMITS,
+    WEB_CONCURRENCY,
+)
+
+
+class Overloaded(Exception):
+    """Raised when a request or tool call is shed instead of queued."""
+
+    def __init__(self, message, retry_after=1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout):
+        """Take one token, waiting up to `timeout` seconds. Returns True on success."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate if self.rate > 0 else timeout
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(wait, remaining))
+
+    def refund(self):
+        """Give back a token that was taken for a call that never ran."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that grows additively while calls stay under the
+    target latency and shrinks multiplicatively when they don't (AIMD).
+    """
+
+    def __init__(self, initial, min_limit, max_limit, target_latency, backoff=0.75):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, latency, ok=True):
+        with self.condition:
+            self.in_flight -= 1
+            if ok and latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            else:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            self.condition.notify_all()
+
+    def snapshot(self):
+        with self.condition:
+            return {"limit": round(self.limit, 2), "in_flight": self.in_flight}
+
+
+class AdmissionController:
+    """Bounded in-flight + bounded queue for incoming requests."""
+
+    def __init__(self, max_in_flight, max_queued, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.shed = 0
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def admit(self):
+        with self.condition:
+            if self.in_flight >= self.max_in_flight:
+                if self.queued >= self.max_queued:
+                    self.shed += 1
+                    raise Overloaded("Server is busy, please retry shortly.", retry_after=self.queue_timeout)
+
+                self.queued += 1
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while self.in_flight >= self.max_in_flight:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.shed += 1
+                            raise Overloaded("Timed out waiting in queue.", retry_after=self.queue_timeout)
+                        self.condition.wait(remaining)
+                finally:
+                    self.queued -= 1
+
+            self.in_flight += 1
+
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.in_flight -= 1
+                self.condition.notify()
+
+    def snapshot(self):
+        with self.condition:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "shed": self.shed,
+                "max_in_flight": self.max_in_flight,
+                "max_queued": self.max_queued,
+            }
+
+
+# ===========================================
+# SHARED INSTANCES
+# ===========================================
+
+admission = AdmissionController(MAX_INFLIGHT_REQUESTS, MAX_QUEUED_REQUESTS, QUEUE_TIMEOUT_SECONDS)
+
+def worker_share(cfg, workers=WEB_CONCURRENCY):
+    """This process's part of a provider quota that all workers split."""
+    return {
+        **cfg,
+        "rate": cfg["rate"] / workers,
+        "burst": max(1, cfg["burst"] // workers),
+        "max_concurrency": max(1, cfg["max_concurrency"] // workers),
+    }
+
+
+_shares = {name: worker_share(cfg) for name, cfg in TOOL_LIMITS.items()}
+
+_buckets = {
+    name: TokenBucket(cfg["rate"], cfg["burst"])
+    for name, cfg in _shares.items()
+}
+
+_limiters = {
+    name: AdaptiveLimiter(
+        initial=cfg["max_concurrency"],
+        min_limit=1,
+        max_limit=cfg["max_concurrency"],
+        target_latency=cfg["target_latency"],
+    )
+    for name, cfg in _shares.items()
+}
+
+
+@contextmanager
+def tool_slot(name, max_wait=None):
+    """
+    Gate one call to an external provider.
+    Raises Overloaded if no token or concurrency slot frees up in time
+    (the provider's max_wait, or less if the caller's budget is shorter).
+    The wait for the token and for the slot share that one bound.
+    """
+    bucket = _buckets.get(name)
+    limiter = _limiters.get(name)
+    if bucket is None:
+        yield
+        return
+
+    wait = TOOL_LIMITS[name]["max_wait"]
+    if max_wait is not None:
+        wait = min(wait, max_wait)
+    wait_until = time.monotonic() + wait
+    if not bucket.acquire(wait):
+        # A zero rate never refills; tell the client to come back much later
+        raise Overloaded(f"{name} rate limit reached", retry_after=1.0 / bucket.rate if bucket.rate > 0 else 60.0)
+    if not limiter.acquire(max(wait_until - time.monotonic(), 0.0)):
+        # The call never ran, so it shouldn't use up the rate quota
+        bucket.refund()
+        raise Overloaded(f"{name} concurrency limit reached")
+
+    start = time.monotonic()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        limiter.release(time.monotonic() - start, ok)
+
+
+def tool_limits_snapshot():
+    """Current adaptive limits per provider (for /health)."""
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
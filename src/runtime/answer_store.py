@@ -0,0 +1,138 @@
+"""
+Answer Store — precomputed answers for hot queries
+--------------------------------------------------
+A SQLite table of (index_version, normalized query) -> answer, filled by
+`python -m src.precompute`. Each answer is stamped with the version of the
+FAISS index it was generated from: the manifest's current version for a
+versioned index, otherwise a content hash of the index files. After the
+index is rebuilt the version changes, so old answers stop matching
+immediately; the next precompute run prunes them.
+
+The web app keeps the current version's answers in memory and reloads them
+when the index or the store file changes, so a hit costs a dict lookup and
+two stat() calls.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from src.config.settings import ANSWER_STORE_PATH, FAISS_DB_PATH, SERVE_PRECOMPUTED
+from src.runtime.singleflight import normalize_query
+from src.tools.rag.index_manager import read_manifest
+
+INDEX_FILES = ("index.faiss", "index.pkl")
+
+_version_cache = {}
+_version_lock = threading.Lock()
+
+
+def index_version(path=FAISS_DB_PATH):
+    """Version of the saved FAISS index, or None if there is no index."""
+    if not path:
+        return None
+    manifest = read_manifest(path)
+    if manifest is not None:
+        return manifest["current"]
+    files = [os.path.join(path, name) for name in INDEX_FILES]
+    try:
+        stats = tuple((st.st_size, st.st_mtime_ns) for st in map(os.stat, files))
+    except FileNotFoundError:
+        return None
+
+    # Hashing ~1 MB is cheap, but only redo it when the files change
+    with _version_lock:
+        cached = _version_cache.get(path)
+        if cached and cached[0] == stats:
+            return cached[1]
+        digest = hashlib.sha1()
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        version = digest.hexdigest()[:16]
+        _version_cache[path] = (stats, version)
+        return version
+
+
+class AnswerStore:
+    def __init__(self, path=ANSWER_STORE_PATH, index_path=FAISS_DB_PATH):
+        self.path = path
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._loaded_key = None
+        self._answers = {}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS answers (
+                index_version TEXT NOT NULL,
+                query_key TEXT NOT NULL,
+                query TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (index_version, query_key)
+            )
+        ''')
+        return conn
+
+    def put(self, query, answer, tool, version):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                (version, normalize_query(query), query, answer, tool, time.time()),
+            )
+        conn.close()
+
+    def keys(self, version):
+        conn = self._connect()
+        rows = conn.execute("SELECT query_key FROM answers WHERE index_version = ?", (version,)).fetchall()
+        conn.close()
+        return {row[0] for row in rows}
+
+    def prune(self, version):
+        """Delete answers generated from any other index version."""
+        conn = self._connect()
+        with conn:
+            deleted = conn.execute("DELETE FROM answers WHERE index_version != ?", (version,)).rowcount
+        conn.close()
+        return deleted
+
+    def get(self, query):
+        """Precomputed {"answer", "tool"} for the query under the current index, or None."""
+        if not os.path.exists(self.path):
+            return None
+        version = index_version(self.index_path)
+        if version is None:
+            return None
+
+        key = (version, os.stat(self.path).st_mtime_ns)
+        if key != self._loaded_key:
+            with self._lock:
+                if key != self._loaded_key:
+                    self._reload(version)
+                    self._loaded_key = key
+        return self._answers.get(normalize_query(query))
+
+    def _reload(self, version):
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT query_key, answer, tool FROM answers WHERE index_version = ?", (version,)
+        ).fetchall()
+        conn.close()
+        self._answers = {k: {"answer": answer, "tool": tool} for k, answer, tool in rows}
+        print(f"⚡ Answer store: {len(self._answers)} precomputed answers for index {version}")
+
+    def snapshot(self):
+        return {
+            "enabled": SERVE_PRECOMPUTED,
+            "index_version": self._loaded_key[0] if self._loaded_key else None,
+            "answers": len(self._answers),
+        }
+
+
+answer_store = AnswerStore()
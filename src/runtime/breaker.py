@@ -0,0 +1,133 @@
+"""
+Circuit Breakers — fail fast when an external provider is down or slow
+----------------------------------------------------------------------
+Each provider (europepmc, tavily) gets a breaker that opens after
+repeated failures or slow calls. While open, calls fail immediately with
+CircuitOpen and the decider routes around the tool. After the reset
+timeout one trial call is let through (half-open); success closes the
+breaker again, failure re-opens it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from src.config.settings import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_SLOW_CALL_SECONDS,
+    BREAKER_RESET_SECONDS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Which provider backs each graph tool
+TOOL_PROVIDERS = {
+    "research": "europepmc",
+    "websearch": "tavily",
+}
+
+
+class CircuitOpen(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold, slow_call_seconds, reset_seconds):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def _current_state(self):
+        # Caller holds the lock
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        return self.state
+
+    def is_available(self):
+        """True if a call would currently be allowed (used for routing)."""
+        with self.lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and not self.trial_in_flight)
+
+    def allow(self):
+        with self.lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"🔌 Circuit OPEN for {self.name} after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    @contextmanager
+    def guard(self, ignore=()):
+        """
+        Wrap one provider call. Exceptions (except `ignore`) and calls slower
+        than slow_call_seconds count as failures.
+        """
+        if not self.allow():
+            raise CircuitOpen(f"{self.name} is temporarily unavailable")
+
+        start = time.monotonic()
+        try:
+            yield
+        except ignore:
+            with self.lock:
+                self.trial_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+
+        if time.monotonic() - start > self.slow_call_seconds:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def snapshot(self):
+        with self.lock:
+            return {"state": self._current_state(), "failures": self.failures}
+
+
+_breakers = {
+    name: CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_SLOW_CALL_SECONDS, BREAKER_RESET_SECONDS)
+    for name in TOOL_PROVIDERS.values()
+}
+
+
+def get_breaker(provider):
+    return _breakers[provider]
+
+
+def tool_available(tool_name):
+    """False if the tool's provider breaker is open. Local tools are always available."""
+    provider = TOOL_PROVIDERS.get(tool_name)
+    return provider is None or _breakers[provider].is_available()
+
+
+def breaker_states():
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
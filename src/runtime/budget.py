@@ -0,0 +1,123 @@
+"""
+Latency Budget — a per-request deadline carried through the graph
+-----------------------------------------------------------------
+Every request gets an absolute deadline in state["deadline"] (a
+time.monotonic() value). /chat sets it when the request arrives, so time
+spent queueing for admission counts; otherwise the first graph node sets
+it to REQUEST_BUDGET_SECONDS from now.
+
+Nodes size their work from the time left:
+
+    tool_timeout          provider timeout, leaving LLM_RESERVE_SECONDS for the answer
+    retrieval_candidates  the full rerank funnel only when there is time for it
+    llm_for               model tier, max_tokens and request timeout for an LLM call
+
+When too little is left for a useful answer, llm_for returns None and the
+node falls back to what it already has instead of overrunning the budget.
+That fallback is recorded with mark_degraded, so /chat reports it and
+precompute/batch don't treat it as a normal answer.
+"""
+import time
+
+from src.config.settings import (
+    REQUEST_BUDGET_SECONDS,
+    LLM_RESERVE_SECONDS,
+    RETRIEVAL_FULL_DEPTH_SECONDS,
+    RAG_CANDIDATES,
+    LLM_MAX_TOKENS,
+    LLM_MIN_TOKENS,
+    STRONG_MODEL_MIN_SECONDS,
+    LLM_TIERS,
+)
+
+# Shortest provider timeout worth attempting
+MIN_TOOL_TIMEOUT = 0.5
+
+
+def new_deadline(budget=REQUEST_BUDGET_SECONDS):
+    return time.monotonic() + budget
+
+
+def ensure_deadline(state):
+    """Start the clock if the caller didn't."""
+    if not state.get("deadline"):
+        state["deadline"] = new_deadline()
+    return state
+
+
+def remaining(state):
+    """Seconds left in the request's budget."""
+    deadline = state.get("deadline")
+    if not deadline:
+        return REQUEST_BUDGET_SECONDS
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired(state):
+    return remaining(state) <= 0
+
+
+def tool_timeout(state, default):
+    """
+    The provider's configured timeout, cut short so the answer still fits.
+    multi_executor hands tools a deadline with the reserve already taken off
+    (state["llm_reserved"]), so it isn't taken off twice.
+    """
+    reserve = 0.0 if state.get("llm_reserved") else LLM_RESERVE_SECONDS
+    return max(MIN_TOOL_TIMEOUT, min(default, remaining(state) - reserve))
+
+
+def retrieval_candidates(state, k):
+    """How many FAISS rows to fetch before reranking down to k."""
+    return RAG_CANDIDATES if remaining(state) >= RETRIEVAL_FULL_DEPTH_SECONDS else k
+
+
+def llm_settings(state, strong=False):
+    """
+    {"tier", "model", "max_tokens", "timeout"} for an LLM call that must
+    finish within the budget, or None if there isn't time for one.
+    The strong tier is only used when the budget can afford it.
+    """
+    budget = remaining(state)
+    tier = "strong" if strong and budget >= STRONG_MODEL_MIN_SECONDS else "fast"
+    spec = LLM_TIERS[tier]
+
+    generation_seconds = budget - spec["first_token_seconds"]
+    max_tokens = min(LLM_MAX_TOKENS, int(generation_seconds * spec["tokens_per_second"]))
+    if max_tokens < LLM_MIN_TOKENS:
+        return None
+    return {"tier": tier, "model": spec["model"], "max_tokens": max_tokens, "timeout": budget}
+
+
+def mark_degraded(metadata, reason, **details):
+    """
+    metadata with a degradation recorded under "degraded", next to any already
+    there (e.g. a circuit-open skip). List details are appended to, e.g.
+    mark_degraded(meta, "budget", llm_skipped=["rag"]).
+    """
+    degraded = dict((metadata or {}).get("degraded") or {})
+    degraded.setdefault("reason", reason)
+    for key, value in details.items():
+        degraded[key] = degraded.get(key, []) + value if isinstance(value, list) else value
+    return {**(metadata or {}), "degraded": degraded}
+
+
+def llm_for(state, strong=False, temperature=None):
+    """
+    A ChatGroq client sized to the remaining budget, or None if it has run out.
+    It is a copy of the shared client for the model (src/runtime/clients.py),
+    so it reuses that client's connections; invoke_llm passes the timeout per call.
+    """
+    settings = llm_settings(state, strong)
+    if settings is None:
+        print(f"⏱️ Budget: {remaining(state):.1f}s left, skipping LLM call")
+        return None
+
+    from src.runtime.clients import clients
+
+    print(f"⏱️ Budget: {remaining(state):.1f}s left → {settings['model']} "
+          f"(max_tokens={settings['max_tokens']})")
+    return clients.llm(settings["model"], temperature).model_copy(update={
+        "max_tokens": settings["max_tokens"],
+        "request_timeout": settings["timeout"],
+    })
@@ -0,0 +1,70 @@
+"""
+Shared Clients — one Groq, Tavily and Europe PMC client per process
+-------------------------------------------------------------------
+Building a ChatGroq creates a new groq SDK client (and HTTP connection
+pool) and takes tens of milliseconds; doing that per LLM call threw away
+keep-alive connections on every request. Clients are built once here and
+reused by every node:
+
+    llm(model, temperature)   ChatGroq per (model, temperature), no retries
+    tavily()                  TavilyClient (pooled requests.Session)
+    europepmc()               EuropePMCClient (pooled requests.Session)
+
+Per-call settings that depend on the latency budget (max_tokens, timeout)
+are applied to a cheap copy that shares the underlying SDK client; see
+budget.llm_for. AssistantService owns the shared instance and warms it up.
+"""
+import os
+import threading
+
+from src.config.settings import LLM_TIERS
+
+
+class Clients:
+    def __init__(self):
+        self._llms = {}
+        self._lock = threading.Lock()
+
+    def llm(self, model, temperature=None):
+        key = (model, temperature)
+        llm = self._llms.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(key)
+                if llm is None:
+                    from langchain_groq import ChatGroq
+
+                    kwargs = {"temperature": temperature} if temperature is not None else {}
+                    llm = ChatGroq(
+                        model=model,
+                        api_key=os.getenv("GROQ_API_KEY"),
+                        # A retry would not fit in the budget the timeout already uses up
+                        max_retries=0,
+                        **kwargs
+                    )
+                    self._llms[key] = llm
+        return llm
+
+    def tavily(self):
+        from src.tools.websearch.tavily_client import get_client
+        return get_client()
+
+    def europepmc(self):
+        from src.tools.research.europepmc import get_client
+        return get_client()
+
+    def warm_up(self, temperatures=(None, 0.3)):
+        """Build the clients the graph uses, so the first request doesn't pay for it."""
+        if os.getenv("GROQ_API_KEY"):
+            for spec in LLM_TIERS.values():
+                for temperature in temperatures:
+                    self.llm(spec["model"], temperature)
+        if os.getenv("TAVILY_API_KEY"):
+            self.tavily()
+        self.europepmc()
+
+    def snapshot(self):
+        return {"llms": [f"{model}@{temperature}" for model, temperature in self._llms]}
+
+
+clients = Clients()
@@ -0,0 +1,201 @@
+"""
+Request Profiler — opt-in sampling profiles of single /chat requests
+--------------------------------------------------------------------
+A profiled request gets a sampler thread that reads the stacks of the
+threads working for it (sys._current_frames) every PROFILE_INTERVAL_MS and
+counts identical stacks. Graph nodes run on the request thread; work handed
+to helper pools (speculative retrieval) is followed by
+wrapping it with follow(), which registers the helper thread for as long as
+it runs that call.
+
+The result is written as folded stacks, one "frame;frame;frame count" line
+per distinct stack, to PROFILE_DIR/<request_id>.folded. That is the input
+format of flamegraph.pl, speedscope and inferno:
+
+    flamegraph.pl data/profiles/<request_id>.folded > profile.svg
+
+Requests that are not profiled only pay for should_profile() and a
+ContextVar lookup in follow().
+"""
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from src.config.settings import (
+    PROFILE_SAMPLE_RATE, PROFILE_ON_REQUEST, PROFILE_TOKEN, PROFILE_INTERVAL_MS, PROFILE_DIR, PROFILE_KEEP
+)
+
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Frames from these files add depth to every stack without telling anything
+SKIP_FILES = ("threading.py", "concurrent/futures/thread.py")
+
+_current = ContextVar("request_profiler", default=None)
+
+
+def token_ok(token):
+    """True if no PROFILE_TOKEN is configured or `token` matches it."""
+    return not PROFILE_TOKEN or hmac.compare_digest(str(token or ""), PROFILE_TOKEN)
+
+
+def should_profile(flag=None, token=None):
+    """Profile if the client asked for it (and that's allowed) or the request is sampled."""
+    if flag and PROFILE_ON_REQUEST and token_ok(token) and str(flag).lower() in ("1", "true", "yes"):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def valid_request_id(request_id):
+    return bool(request_id) and REQUEST_ID_RE.match(request_id) is not None
+
+
+def profile_path(request_id, directory=PROFILE_DIR):
+    if not valid_request_id(request_id):
+        raise ValueError(f"invalid request id: {request_id!r}")
+    return os.path.join(directory, f"{request_id}.folded")
+
+
+def frame_label(code):
+    filename = code.co_filename
+    for marker in ("site-packages" + os.sep, os.sep + "src" + os.sep):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def fold(frame, root):
+    """Folded stack for one frame, outermost call first, rooted at the thread's role."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        if not code.co_filename.endswith(SKIP_FILES):
+            labels.append(frame_label(code))
+        frame = frame.f_back
+    labels.append(root)
+    # ';' separates frames; the count follows the last space, so spaces are fine
+    return ";".join(label.replace(";", ":") for label in reversed(labels))
+
+
+class RequestProfiler:
+    """
+    Samples the registered threads while the `with` block runs and writes
+    the profile when it exits. The thread entering it is registered as "request".
+    """
+
+    def __init__(self, request_id, interval_ms=PROFILE_INTERVAL_MS, directory=PROFILE_DIR):
+        self.request_id = request_id
+        self.interval = max(interval_ms, 1) / 1000
+        self.path = profile_path(request_id, directory)
+        self.counts = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._token = None
+        self._started = 0.0
+
+    def register(self, ident, role):
+        with self._lock:
+            self._threads[ident] = role
+
+    def unregister(self, ident):
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, role in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.counts[fold(frame, role)] += 1
+            self.samples += 1
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.register(threading.get_ident(), "request")
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.request_id[:8]}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        self.unregister(threading.get_ident())
+        try:
+            self.save()
+        except OSError as e:
+            print(f"⚠️ Profiler: could not write {self.path}: {e}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp, self.path)
+        prune_profiles(os.path.dirname(self.path))
+        print(f"🔬 Profiler: {self.samples} samples over {self.duration:.2f}s → {self.path}")
+
+
+def follow(fn):
+    """
+    Wrap fn so that, if the caller is being profiled, the helper thread that
+    runs it is sampled too. Returns fn unchanged otherwise.
+    """
+    profiler = _current.get()
+    if profiler is None:
+        return fn
+
+    def followed(*args, **kwargs):
+        ident = threading.get_ident()
+        profiler.register(ident, threading.current_thread().name)
+        token = _current.set(profiler)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            profiler.unregister(ident)
+
+    return followed
+
+
+def prune_profiles(directory=PROFILE_DIR, keep=PROFILE_KEEP):
+    """Keep only the newest `keep` profiles."""
+    if keep <= 0:
+        return
+    try:
+        entries = [e for e in os.scandir(directory) if e.name.endswith(".folded")]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def read_profile(request_id, directory=PROFILE_DIR):
+    """Folded stacks for a request, or None if it wasn't profiled (or was pruned)."""
+    try:
+        with open(profile_path(request_id, directory)) as f:
+            return f.read()
+    except (ValueError, FileNotFoundError):
+        return None
@@ -0,0 +1,118 @@
+"""
+Single-Flight — share one execution between identical concurrent calls
+----------------------------------------------------------------------
+The first caller for a key (the leader) runs the function; callers that
+arrive with the same key while it is running wait and receive the same
+result, or the same exception. Nothing is cached: once the leader
+finishes, the next call with that key runs again.
+
+Two groups are used:
+    graph_flights  whole /chat graph runs, keyed by the normalized query
+    tool_flights   provider calls (Groq prompts, Tavily and EuropePMC searches)
+"""
+import re
+import threading
+import time
+
+from src.config.settings import COALESCE_REQUESTS
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    return WHITESPACE_RE.sub(" ", query.lower()).strip().rstrip("?!. ")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name, enabled=COALESCE_REQUESTS):
+        self.name = name
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                print(f"🔗 {self.name}: shared one call with {call.waiters} identical request(s)")
+            call.done.set()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._calls),
+                "executed": self.executed,
+                "shared": self.shared,
+            }
+
+
+graph_flights = SingleFlight("graph")
+tool_flights = SingleFlight("tools")
+
+
+def invoke_llm(llm, prompt):
+    """
+    llm.invoke(prompt) under the Groq slot, shared with identical concurrent prompts.
+    llm.request_timeout is the budget left when the client was sized; the wait
+    for the slot is charged to it, and the call only gets what is left.
+    """
+    from src.runtime.admission import tool_slot
+
+    deadline = time.monotonic() + llm.request_timeout
+
+    def call():
+        with tool_slot("groq", max_wait=deadline - time.monotonic()):
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError("no time left for the Groq call after waiting for a slot")
+            # The SDK client is shared, so its construction-time timeout isn't this call's
+            return llm.invoke(prompt, timeout=left)
+
+    return tool_flights.do(("groq", llm.model_name, llm.temperature, llm.max_tokens, prompt), call)
+
+
+def coalescing_snapshot():
+    return {
+        "graph": graph_flights.snapshot(),
+        "tools": tool_flights.snapshot(),
+    }
@@ -0,0 +1,160 @@
+"""
+Assistant Service — one long-lived owner of the compiled graph
+--------------------------------------------------------------
+The first request in a fresh process would compile the graph, build the
+Groq/Tavily/Europe PMC clients and load the embedder and FAISS index.
+AssistantService does all of that once (warm_up) and then answers any
+number of queries, from any number of threads:
+
+    from src.service import get_service
+
+    service = get_service()
+    service.start()                      # build graph + warm retriever (once)
+    print(service.answer("What is asthma?"))
+    answers = service.answer_many(["What is asthma?", "latest flu news"])
+    answer = await service.aanswer("What is asthma?")
+
+The CLI (src/app.py), the web app, batch/precompute runs and the load test
+all go through get_service(), so a process never compiles the graph twice.
+The clients live in the shared registry the nodes read from
+(src/runtime/clients.py, exposed as service.clients): one ChatGroq per
+model and temperature, one pooled Tavily and Europe PMC session.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.runtime.clients import clients
+
+
+class AssistantService:
+    def __init__(self, speculative=None, warm_retriever=True):
+        self.speculative = speculative
+        self.warm_retriever = warm_retriever
+        self.graph = None
+        self.clients = clients
+        # Readiness per component, updated by warm_up()
+        self.components = {"graph": "pending", "retriever": "pending"}
+        # Set once the graph is built (or failed to build)
+        self.graph_ready = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def warm_up(self):
+        """Build the graph and provider clients, then load the embedder and FAISS index"""
+        print("🔄 Building LangGraph...")
+        self.components["graph"] = "loading"
+        try:
+            from src.langgraph.graph import build_graph
+            self.graph = build_graph(speculative=self.speculative)
+            self.clients.warm_up()
+            self.components["graph"] = "ready"
+            print("✅ Graph ready")
+        except Exception as e:
+            self.components["graph"] = f"error: {e}"
+            print(f"❌ Graph error: {e}")
+        finally:
+            self.graph_ready.set()
+
+        if not self.warm_retriever:
+            self.components["retriever"] = "skipped"
+            return
+
+        print("🔄 Loading embedder and FAISS index...")
+        self.components["retriever"] = "loading"
+        try:
+            from src.tools.rag.retriever import warm_up_retriever
+            warm_up_retriever()
+            self.components["retriever"] = "ready"
+            print("✅ Retriever ready")
+        except Exception as e:
+            self.components["retriever"] = f"error: {e}"
+            print(f"❌ Retriever error: {e}")
+
+    def start(self, background=False):
+        """Run warm_up() once per instance, on a background thread if asked"""
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+        if background:
+            threading.Thread(target=self.warm_up, name="warm-up", daemon=True).start()
+        else:
+            self.warm_up()
+        return self
+
+    def wait(self, timeout=None):
+        """The compiled graph once it is built, or None (build failed or still running after `timeout`)"""
+        self.start(background=True)
+        self.graph_ready.wait(timeout=timeout)
+        return self.graph
+
+    def _graph(self):
+        graph = self.wait()
+        if graph is None:
+            raise RuntimeError(f"graph unavailable ({self.components['graph']})")
+        return graph
+
+    @staticmethod
+    def initial_state(query, deadline=None):
+        state = {
+            "query": query,
+            "tool": "",
+            "results": [],
+            "metadata": {},
+            "final_answer": ""
+        }
+        if deadline is not None:
+            state["deadline"] = deadline
+        return state
+
+    def invoke(self, query, deadline=None):
+        """Final graph state for one query"""
+        return self._graph().invoke(self.initial_state(query, deadline))
+
+    def invoke_with_timings(self, query, deadline=None):
+        """(final state, [(node_name, seconds), ...]) for one query"""
+        from src.langgraph.graph import invoke_with_timings
+        return invoke_with_timings(self._graph(), self.initial_state(query, deadline))
+
+    def answer(self, query, deadline=None):
+        return self.invoke(query, deadline).get("final_answer", "No response generated")
+
+    def answer_many(self, queries, parallel=4):
+        """Answers in the order of `queries`; the first failure is raised"""
+        queries = list(queries)
+        if parallel <= 1 or len(queries) <= 1:
+            return [self.answer(q) for q in queries]
+        self._graph()
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="answer-many") as pool:
+            return list(pool.map(self.answer, queries))
+
+    async def aanswer(self, query, deadline=None):
+        # Nodes are blocking (HTTP clients, FAISS); run the graph off the event loop
+        return await asyncio.to_thread(self.answer, query, deadline)
+
+    async def aanswer_many(self, queries, parallel=4):
+        semaphore = asyncio.Semaphore(max(parallel, 1))
+
+        async def one(query):
+            async with semaphore:
+                return await self.aanswer(query)
+
+        return list(await asyncio.gather(*(one(q) for q in queries)))
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service(**options):
+    """
+    The process-wide AssistantService. Options (speculative, warm_retriever)
+    only apply to the call that creates it.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AssistantService(**options)
+    return _service
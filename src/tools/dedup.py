@@ -0,0 +1,139 @@
+"""
+Dedup — collapse duplicate and near-duplicate tool results
+----------------------------------------------------------
+Two passes over document results:
+
+    1. identity keys   DOI, PMID or normalized URL; a news link to doi.org,
+                       PubMed or Europe PMC counts as the paper it points to
+    2. near-duplicates MinHash over word 3-gram shingles; pairs whose
+                       estimated Jaccard similarity is >= DEDUP_THRESHOLD
+
+All signatures are computed and compared in NumPy, so a few dozen results
+cost well under a millisecond. The first occurrence (tool order) is kept
+and picks up any identifiers the dropped copy had.
+"""
+import re
+import zlib
+
+import numpy as np
+
+from src.config.settings import DEDUP_THRESHOLD, DEDUP_NUM_PERM
+from src.tools.results import ToolResult
+
+DOI_RE = re.compile(r"10\.\d{4,9}/[^\s?#&]+", re.IGNORECASE)
+PMID_URL_RE = re.compile(
+    r"(?:pubmed\.ncbi\.nlm\.nih\.gov/|europepmc\.org/(?:abstract|article)/med/)(\d+)",
+    re.IGNORECASE,
+)
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+SHINGLE_SIZE = 3
+
+# Universal hashing (a*x + b) mod p; a < 2**31 and x < 2**32 keep a*x inside uint64
+MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+PERM_A = _rng.integers(1, MERSENNE_PRIME, DEDUP_NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.integers(0, MERSENNE_PRIME, DEDUP_NUM_PERM, dtype=np.uint64)
+
+
+def normalize_url(url):
+    url = url.strip().lower().split("#", 1)[0]
+    url = re.sub(r"^https?://(www\.)?", "", url)
+    return url.rstrip("/")
+
+
+def identity_keys(result):
+    """Every key that identifies the same underlying item."""
+    keys = set()
+    if result.doi:
+        keys.add("doi:" + result.doi.strip().lower().rstrip("."))
+    if result.pmid:
+        keys.add("pmid:" + result.pmid.strip())
+    if result.url:
+        keys.add("url:" + normalize_url(result.url))
+        doi = DOI_RE.search(result.url)
+        if doi:
+            keys.add("doi:" + doi.group(0).lower().rstrip("."))
+        pmid = PMID_URL_RE.search(result.url)
+        if pmid:
+            keys.add("pmid:" + pmid.group(1))
+    return keys
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    words = WORD_RE.findall(text.lower())
+    grams = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))} if words else set()
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signatures(texts):
+    """(len(texts), DEDUP_NUM_PERM) signatures, plus a mask of texts that had any words."""
+    signatures = np.full((len(texts), len(PERM_A)), MERSENNE_PRIME, dtype=np.uint64)
+    has_words = np.zeros(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        hashes = shingle_hashes(text)
+        if hashes.size:
+            signatures[i] = ((np.outer(PERM_A, hashes) + PERM_B[:, None]) % MERSENNE_PRIME).min(axis=1)
+            has_words[i] = True
+    return signatures, has_words
+
+
+def near_duplicate_mask(texts, threshold=DEDUP_THRESHOLD):
+    """Boolean keep-mask: False for texts that near-duplicate an earlier kept text."""
+    keep = np.ones(len(texts), dtype=bool)
+    if len(texts) < 2:
+        return keep
+
+    signatures, has_words = minhash_signatures(texts)
+    similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    duplicate = np.triu(similarity >= threshold, k=1)
+    duplicate &= has_words[:, None] & has_words[None, :]
+
+    for i in range(len(texts)):
+        if keep[i]:
+            keep[duplicate[i]] = False
+    return keep
+
+
+def dedup_texts(texts, threshold=DEDUP_THRESHOLD):
+    keep = near_duplicate_mask(texts, threshold)
+    return [t for t, k in zip(texts, keep) if k]
+
+
+def absorb(kept, dropped):
+    """Carry identifiers over from a dropped duplicate."""
+    for field in ("doi", "pmid", "url"):
+        if not getattr(kept, field) and getattr(dropped, field):
+            setattr(kept, field, getattr(dropped, field))
+
+
+def dedup_results(results, threshold=DEDUP_THRESHOLD):
+    """
+    Collapse duplicate document results. Answers, notices and plain
+    strings are always kept. Returns (kept_results, dropped_count).
+    """
+    docs = [i for i, r in enumerate(results) if isinstance(r, ToolResult) and r.kind == "document"]
+    dropped = set()
+
+    # Pass 1: shared DOI / PMID / URL
+    owner = {}
+    for i in docs:
+        keys = identity_keys(results[i])
+        first = next((owner[k] for k in keys if k in owner), None)
+        if first is None:
+            first = i
+        else:
+            dropped.add(i)
+            absorb(results[first], results[i])
+        for k in keys:
+            owner.setdefault(k, first)
+
+    # Pass 2: near-identical text
+    remaining = [i for i in docs if i not in dropped]
+    texts = [f"{results[i].title} {results[i].snippet}" for i in remaining]
+    for i, keep in zip(remaining, near_duplicate_mask(texts, threshold)):
+        if not keep:
+            dropped.add(i)
+
+    kept = [r for i, r in enumerate(results) if i not in dropped]
+    return kept, len(dropped)
@@ -0,0 +1,62 @@
+"""
+Bounded HTTP reads for provider calls
+-------------------------------------
+requests' `timeout` applies to each socket operation, not to the request as
+a whole: a server that trickles its body keeps resetting it. read_body
+streams the body and gives up at a wall-clock deadline (and, optionally, a
+size cap), so a provider call can't overrun the request's latency budget.
+"""
+import time
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+
+class PayloadTooLarge(Exception):
+    """Raised when a response body exceeds the caller's byte cap."""
+
+
+class DeadlineExceeded(requests.exceptions.Timeout, TimeoutError):
+    """The body was not read in time; caught as a requests Timeout or a TimeoutError."""
+
+
+def read_timeout(deadline, connect=3.05):
+    """(connect, read) timeout for requests, never past `deadline` (time.monotonic())."""
+    left = max(deadline - time.monotonic(), 0.01)
+    return (min(connect, left), left)
+
+
+def _socket(response):
+    """The socket under a stream=True requests response, if it can be reached."""
+    try:
+        return response.raw._fp.fp.raw._sock
+    except AttributeError:
+        return None
+
+
+def read_body(response, deadline, max_bytes=None, chunk_size=16384):
+    """
+    The body of a stream=True response, read before `deadline` (time.monotonic()).
+    read1 returns after each socket read, and each read may only wait for
+    the time left, so a body trickled byte by byte still stops at the deadline.
+    """
+    chunks = []
+    size = 0
+    sock = _socket(response)
+    try:
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise DeadlineExceeded(f"response body not read within the deadline ({size} bytes so far)")
+            if sock is not None:
+                sock.settimeout(left)
+            chunk = response.raw.read1(chunk_size, decode_content=True)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise PayloadTooLarge(f"response over {max_bytes} bytes")
+            chunks.append(chunk)
+    except ReadTimeoutError as e:
+        raise DeadlineExceeded(f"response body not read within the deadline ({size} bytes so far)") from e
+    return b"".join(chunks)
@@ -1,6 +1,8 @@
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from src.config.settings import EMBED_MODEL
 
 def get_embedder():
     """Return the embedding model instance."""
+    # Imported here: pulls in sentence-transformers and torch
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
     return HuggingFaceEmbeddings(model_name=EMBED_MODEL)
@@ -0,0 +1,193 @@
+"""
+Index Manager — versioned FAISS index with atomic hot-reload
+------------------------------------------------------------
+build_faiss_index writes every build into its own directory and then
+publishes it by atomically replacing manifest.json:
+
+    data/faiss_index/
+        manifest.json              {"current": "20261019T101500-1234", ...}
+        versions/
+            20261019T101500-1234/  index.faiss, index.pkl (, parents.json)
+            ...
+
+A plain index directory without a manifest (the old layout) still works;
+it is treated as a single unversioned index.
+
+IndexManager holds the loaded version. Searches take it with acquire(), a
+reference-counted handle. A background watcher polls the manifest; when a
+new version is published it is loaded (and warmed) off the request path,
+then swapped in under a lock, so the next acquire() gets the new version
+while searches already running finish on the old one. The old version is
+dropped as soon as its last reader is done.
+"""
+import gc
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+MANIFEST_FILE = "manifest.json"
+VERSIONS_DIR = "versions"
+
+
+def read_manifest(root):
+    """The manifest dict, or None for an unversioned index directory."""
+    if not root:
+        return None
+    try:
+        with open(os.path.join(root, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def resolve_index(root):
+    """(version, directory) of the index to load; version is None for an unversioned directory."""
+    manifest = read_manifest(root)
+    if manifest is None:
+        return None, root
+    return manifest["current"], os.path.join(root, VERSIONS_DIR, manifest["current"])
+
+
+def new_version_dir(root):
+    """Create and return (version, directory) for a new build under root."""
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+    path = os.path.join(root, VERSIONS_DIR, version)
+    os.makedirs(path)
+    return version, path
+
+
+def publish_version(root, version, keep=3, **info):
+    """Point the manifest at `version` (atomic rename), keeping it and the newest keep - 1 others."""
+    manifest = {"current": version, "published_at": time.time(), **info}
+    tmp_path = os.path.join(root, f".{MANIFEST_FILE}.{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(root, MANIFEST_FILE))
+    print(f"📦 Published index version {version}")
+
+    versions_root = os.path.join(root, VERSIONS_DIR)
+    others = [v for v in sorted(os.listdir(versions_root)) if v != version]
+    for stale in others[:max(len(others) - (keep - 1), 0)]:
+        # Processes still reading an old version keep their open/mapped files
+        shutil.rmtree(os.path.join(versions_root, stale), ignore_errors=True)
+
+
+class IndexHandle:
+    __slots__ = ("version", "path", "db", "readers", "retired")
+
+    def __init__(self, version, path, db):
+        self.version = version
+        self.path = path
+        self.db = db
+        self.readers = 0
+        self.retired = False
+
+
+class IndexManager:
+    def __init__(self, root, loader, watch_seconds=30):
+        self.root = root
+        self.loader = loader
+        self.watch_seconds = watch_seconds
+        self.reloads = 0
+        self._current = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._watcher_pid = None
+
+    def is_loaded(self):
+        return self._current is not None
+
+    def current(self):
+        """Handle for the live version, loading it on first use."""
+        if self._current is None:
+            with self._load_lock:
+                if self._current is None:
+                    version, path = resolve_index(self.root)
+                    self._current = IndexHandle(version, path, self.loader(path))
+        self._ensure_watcher()
+        return self._current
+
+    @contextmanager
+    def acquire(self):
+        """The live vectorstore, kept alive until the block exits even if a new version is swapped in."""
+        self.current()
+        with self._lock:
+            handle = self._current
+            handle.readers += 1
+        try:
+            yield handle.db
+        finally:
+            with self._lock:
+                handle.readers -= 1
+                release = handle.retired and handle.readers == 0
+            if release:
+                self._release(handle)
+
+    def check_for_update(self):
+        """Load and switch to a newly published version. Returns True if it switched."""
+        if self._current is None:
+            return False
+        version, path = resolve_index(self.root)
+        if version == self._current.version:
+            return False
+
+        with self._load_lock:
+            if version == self._current.version:
+                return False
+            print(f"🔄 Loading index version {version} in the background...")
+            start = time.perf_counter()
+            handle = IndexHandle(version, path, self.loader(path))
+
+            with self._lock:
+                old, self._current = self._current, handle
+                old.retired = True
+                release = old.readers == 0
+            self.reloads += 1
+            print(f"✅ Switched to index version {version} (loaded in {time.perf_counter() - start:.1f}s)")
+
+        if release:
+            self._release(old)
+        return True
+
+    def _release(self, handle):
+        handle.db = None
+        gc.collect()
+        print(f"♻️ Released index version {handle.version}")
+
+    def _ensure_watcher(self):
+        # Threads don't survive fork, so each (preloaded, then forked) worker starts its own
+        if not self.watch_seconds or self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+        threading.Thread(target=self._watch, name="index-watcher", daemon=True).start()
+
+    def detach_watcher(self):
+        """Stop watching in this process; a forked child starts its own watcher on first use."""
+        with self._lock:
+            self._watcher_pid = None
+
+    def _watch(self):
+        pid = os.getpid()
+        while self._watcher_pid == pid:
+            time.sleep(self.watch_seconds)
+            try:
+                self.check_for_update()
+            except Exception as e:
+                print(f"⚠️ Index reload failed, keeping the current version: {e}")
+
+    def snapshot(self):
+        handle = self._current
+        return {
+            "version": handle.version if handle else None,
+            "vectors": handle.db.index.ntotal if handle and handle.db is not None else None,
+            "readers": handle.readers if handle else 0,
+            "reloads": self.reloads,
+        }
@@ -0,0 +1,167 @@
+"""
+Multi-Vector Index — several vectors per disease row
+----------------------------------------------------
+With INDEX_MODE=multi, build_faiss_index embeds each row as short child
+texts instead of one long blob:
+
+    Disease: <name>\nSymptoms: <SYMPTOM_GROUP_SIZE symptoms>    one per group
+    Disease: <name>\nTreatments: <treatments>                   one per row
+
+A query naming two or three symptoms then lines up with the child holding
+them instead of a whole-row vector diluted by everything else. Children
+map back to their parent row through parents.json, saved next to the
+index. At query time FAISS returns children, NumPy folds their scores into
+one score per disease, and the full parent rows are returned, one per
+disease (rows without a name are grouped by identical text).
+
+Convert an existing row index without re-downloading the dataset (the
+result is published as a new version under the target directory, which
+may be the source itself):
+    python -m src.tools.rag.multivector data/faiss_index data/faiss_index_multi
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+PARENTS_FILE = "parents.json"
+
+ROW_FIELDS_RE = re.compile(r"^Disease:(.*)\nSymptoms:(.*)\nTreatments:(.*)$", re.DOTALL)
+
+
+def row_text(disease, symptoms, treatments):
+    return (
+        f"Disease: {disease}\n"
+        f"Symptoms: {symptoms}\n"
+        f"Treatments: {treatments}"
+    )
+
+
+def split_symptoms(symptoms, group_size):
+    items = [s.strip() for s in re.split(r"[,;]", symptoms or "") if s.strip()]
+    return [", ".join(items[i:i + group_size]) for i in range(0, len(items), group_size)]
+
+
+def child_texts(disease, symptoms, treatments, group_size):
+    children = [f"Disease: {disease}\nSymptoms: {group}" for group in split_symptoms(symptoms, group_size)]
+    if treatments:
+        children.append(f"Disease: {disease}\nTreatments: {treatments}")
+    return children or [row_text(disease, symptoms, treatments)]
+
+
+class ParentIndex:
+    """Child vector -> parent row mapping, plus per-query parent aggregation."""
+
+    def __init__(self, rows, diseases, child_parent):
+        self.rows = rows
+        self.diseases = diseases
+        self.child_parent = np.asarray(child_parent, dtype=np.int64)
+
+        # Rows that share a disease name (or, unnamed, identical text) form one group
+        keys = [d.strip().lower() or f"row:{text}" for d, text in zip(diseases, rows)]
+        _, self.parent_group = np.unique(np.array(keys, dtype=object), return_inverse=True)
+
+    @classmethod
+    def from_rows(cls, rows, group_size):
+        """rows: (disease, symptoms, treatments) tuples. Returns (child_texts, ParentIndex)."""
+        texts, child_parent, parents, diseases = [], [], [], []
+        for parent_id, (disease, symptoms, treatments) in enumerate(rows):
+            parents.append(row_text(disease, symptoms, treatments))
+            diseases.append(disease)
+            for child in child_texts(disease, symptoms, treatments, group_size):
+                texts.append(child)
+                child_parent.append(parent_id)
+        return texts, cls(parents, diseases, child_parent)
+
+    def save(self, path):
+        with open(os.path.join(path, PARENTS_FILE), "w") as f:
+            json.dump({
+                "rows": self.rows,
+                "diseases": self.diseases,
+                "child_parent": self.child_parent.tolist(),
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        """The saved mapping, or None for a one-vector-per-row index."""
+        file_path = os.path.join(path, PARENTS_FILE)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path) as f:
+            data = json.load(f)
+        return cls(data["rows"], data["diseases"], data["child_parent"])
+
+    def top_rows(self, scores, child_ids, k, sum_weight):
+        """
+        scores/child_ids: FAISS output, (n_queries, n_children), higher score = closer.
+        A disease scores its best child plus sum_weight times the rest, so
+        matching several symptom groups beats matching one. Returns up to k
+        parent rows per query, best first, one per disease.
+        """
+        results = []
+        for query_scores, ids in zip(scores, child_ids):
+            valid = ids >= 0
+            ids, query_scores = ids[valid], query_scores[valid]
+            if not ids.size:
+                results.append([])
+                continue
+
+            parents = self.child_parent[ids]
+            groups = self.parent_group[parents]
+            _, best_child, inverse = np.unique(groups, return_index=True, return_inverse=True)
+            # np.unique keeps the first occurrence; FAISS returns children best-first
+            best = query_scores[best_child]
+            total = np.bincount(inverse, weights=query_scores)
+            group_scores = best + sum_weight * (total - best)
+
+            order = np.argsort(-group_scores, kind="stable")[:k]
+            results.append([self.rows[parents[best_child[g]]] for g in order])
+        return results
+
+
+def similarity_scores(index, distances):
+    """FAISS distances as higher-is-better scores (L2 distances map into (0, 1])."""
+    import faiss
+
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        return distances
+    return 1.0 / (1.0 + np.maximum(distances, 0.0))
+
+
+def rows_from_docstore(db):
+    """(disease, symptoms, treatments) for every row of an existing row index, in index order."""
+    rows = []
+    for i in range(db.index.ntotal):
+        text = db.docstore.search(db.index_to_docstore_id[i]).page_content
+        match = ROW_FIELDS_RE.match(text)
+        if match:
+            rows.append(tuple(part.strip() for part in match.groups()))
+        else:
+            rows.append((text.strip(), "", ""))
+    return rows
+
+
+def main():
+    import argparse
+    import sys
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+    from src.config.settings import SYMPTOM_GROUP_SIZE
+    from src.tools.rag.retriever import build_multi_vector_index, load_vectorstore
+    from src.tools.rag.embedder import get_embedder
+
+    parser = argparse.ArgumentParser(description="Convert a row FAISS index into a multi-vector one")
+    parser.add_argument("source", help="Existing one-vector-per-row index directory")
+    parser.add_argument("target", help="Directory for the multi-vector index")
+    parser.add_argument("--group-size", type=int, default=SYMPTOM_GROUP_SIZE)
+    args = parser.parse_args()
+
+    embeddings = get_embedder()
+    rows = rows_from_docstore(load_vectorstore(embeddings, args.source, mmap=False))
+    build_multi_vector_index(rows, embeddings, args.target, args.group_size)
+
+
+if __name__ == "__main__":
+    main()
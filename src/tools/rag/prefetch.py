@@ -0,0 +1,60 @@
+"""
+Speculative RAG retrieval
+-------------------------
+Starts the FAISS lookup (embedding + search + rerank, no LLM) as soon as a request
+enters the graph, so it runs while the decider is still routing. The RAG
+agent picks the result up if the route includes RAG; otherwise it is
+cancelled or simply dropped.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import PREFETCH_WORKERS, RAG_TOP_K
+from src.tools.rag import reranker
+from src.runtime.budget import ensure_deadline
+from src.runtime.profiler import follow
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="rag-prefetch")
+
+
+def start_prefetch(state):
+    """LangGraph node: kick off retrieval for the raw query and return immediately."""
+    query = state["query"]
+    ensure_deadline(state)
+    future = _prefetch_pool.submit(follow(reranker.retrieve_ranked), query, RAG_TOP_K)
+    print(f"⚡ Prefetch: started speculative retrieval for '{query[:50]}'")
+    return {
+        **state,
+        "prefetch": {"query": query, "k": RAG_TOP_K, "future": future}
+    }
+
+
+def take_prefetched(state, query, k, candidates=None):
+    """
+    Return prefetched rows if they were started for this exact query and k,
+    otherwise run the retrieval now (over `candidates` rows, default RAG_CANDIDATES).
+    A prefetch still queued behind other requests' jobs is cancelled and run
+    here instead of waited for.
+    """
+    prefetch = state.get("prefetch") or {}
+    future = prefetch.get("future")
+
+    if future is not None and future.cancel():
+        print("⚡ Prefetch: still queued, retrieving inline")
+    elif future is not None and prefetch.get("query") == query and prefetch.get("k") == k:
+        try:
+            rows = future.result()
+            print("⚡ Prefetch: using speculative retrieval result")
+            return rows
+        except Exception as e:
+            print(f"⚠️ Prefetch failed, retrieving again: {e}")
+
+    if candidates is None:
+        return reranker.retrieve_ranked(query, k)
+    return reranker.retrieve_ranked(query, k, candidates=candidates)
+
+
+def discard_prefetch(state):
+    """Cancel a speculative retrieval the chosen route won't use."""
+    future = (state.get("prefetch") or {}).get("future")
+    if future is not None and future.cancel():
+        print("⚡ Prefetch: cancelled (route does not use RAG)")
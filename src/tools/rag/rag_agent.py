@@ -4,9 +4,13 @@ RAG Agent — part of the Medical Chatbot AI System
 Uses FAISS + Groq LLM to answer disease/symptom-related queries.
 """
 
-import os
-from langchain_groq import ChatGroq
-from src.tools.rag.retriever import retrieve_semantic_results
+from src.config.settings import RAG_TOP_K
+from src.tools.rag.prefetch import take_prefetched
+from src.runtime.singleflight import invoke_llm
+from src.runtime.budget import llm_for, retrieval_candidates, mark_degraded
+from src.runtime.admission import Overloaded
+from src.tools.results import ToolResult
+from src.tools.dedup import dedup_texts
 
 def rag_agent(state: dict):
     """
@@ -19,8 +23,13 @@ def rag_agent(state: dict):
     # Debug: Print incoming state
     print(f"🔍 [RAG Agent] Incoming state keys: {state.keys()}")
 
-    # Step 1: Retrieve from FAISS
-    results = retrieve_semantic_results(query, k=3)
+    # Step 1: Retrieve wide from FAISS and rerank down to RAG_TOP_K
+    # (reuses a speculative prefetch if one was started; narrower when short on time)
+    results = take_prefetched(state, query, k=RAG_TOP_K, candidates=retrieval_candidates(state, RAG_TOP_K))
+
+    # Overlapping rows only cost prompt tokens
+    if results:
+        results = dedup_texts(results)
 
     print(f"🔍 [RAG Agent] Retrieved {len(results) if results else 0} documents")
 
@@ -28,14 +37,19 @@ def rag_agent(state: dict):
         print("⚠️ [RAG Agent] No results found")
         return {
             **state,
-            "results": ["No relevant disease or symptom data found in the knowledge base."]
+            "results": [ToolResult.notice("rag", "No relevant disease or symptom data found in the knowledge base.")]
         }
 
-    # Step 2: Summarize with LLM
-    llm = ChatGroq(
-        model="llama-3.1-8b-instant",
-        api_key=os.getenv("GROQ_API_KEY")
-    )
+    # Step 2: Summarize with LLM (fast tier, sized to the remaining budget)
+    llm = llm_for(state)
+
+    if llm is None:
+        # Out of time: hand the retrieved rows on as they are
+        return {
+            **state,
+            "metadata": mark_degraded(state.get("metadata"), "budget", llm_skipped=["rag"]),
+            "results": [ToolResult(source="rag", snippet=row) for row in results]
+        }
 
     context = "\n\n".join(results)
     prompt = f"""You are a medical assistant.
@@ -55,7 +69,7 @@ Answer:
 """
 
     try:
-        response = llm.invoke(prompt)
+        response = invoke_llm(llm, prompt)
 
         # Extract content properly
         final_answer = response.content if hasattr(response, 'content') else str(response)
@@ -66,21 +80,26 @@ Answer:
         # CRITICAL: Create return dict
         return_dict = {
             **state,
-            "results": [final_answer]
+            "results": [ToolResult(source="rag", snippet=final_answer, kind="answer")]
         }
 
         # Debug: Verify what we're returning
         print(f"🔍 [RAG Agent] Returning results list length: {len(return_dict['results'])}")
         print(f"🔍 [RAG Agent] First result type: {type(return_dict['results'][0])}")
-        print(f"🔍 [RAG Agent] First result length: {len(return_dict['results'][0])}")
+        print(f"🔍 [RAG Agent] First result length: {len(return_dict['results'][0].snippet)}")
 
         return return_dict
 
+    except Overloaded:
+        # Shed by the Groq limiter: let /chat answer 503 with Retry-After
+        raise
+
     except Exception as e:
         print(f"❌ [RAG Agent] Error: {e}")
         import traceback
         traceback.print_exc()
         return {
             **state,
-            "results": [f"Error generating response: {str(e)}"]
+            "metadata": mark_degraded(state.get("metadata"), "llm error", llm_failed=["rag"]),
+            "results": [ToolResult.notice("rag", f"Error generating response: {str(e)}")]
         }
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Reranker — wide-then-narrow retrieval funnel
+--------------------------------------------
+FAISS returns RAG_CANDIDATES rows in one search; a cheap CPU scorer then
+reorders them and only the best RAG_TOP_K go into the prompt.
+
+RERANKER selects the scorer:
+    lexical        BM25 over the candidate set, blended with the dense rank (default)
+    cross-encoder  sentence-transformers CrossEncoder (RERANKER_MODEL)
+    none           keep the FAISS order
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+from src.config.settings import RAG_CANDIDATES, RERANKER, RERANKER_MODEL
+from src.tools.rag import retriever
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "have", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "was", "what",
+    "with", "disease", "symptoms", "treatments",
+}
+
+# Weight of the original FAISS rank in the lexical score
+DENSE_WEIGHT = 0.3
+
+_cross_encoder = None
+_cross_encoder_lock = threading.Lock()
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def lexical_scores(query, rows, k1=1.2, b=0.75):
+    """BM25 of the query against each row, with IDF taken over the candidate set."""
+    query_terms = set(tokenize(query))
+    docs = [Counter(tokenize(row)) for row in rows]
+    if not query_terms or not docs:
+        return [0.0] * len(rows)
+
+    n = len(docs)
+    avg_len = sum(sum(d.values()) for d in docs) / n or 1.0
+    df = Counter(term for d in docs for term in query_terms if term in d)
+
+    scores = []
+    for d in docs:
+        length = sum(d.values())
+        score = 0.0
+        for term in query_terms:
+            tf = d.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+        scores.append(score)
+    return scores
+
+
+def get_cross_encoder():
+    global _cross_encoder
+    if _cross_encoder is None:
+        with _cross_encoder_lock:
+            if _cross_encoder is None:
+                from sentence_transformers import CrossEncoder
+                _cross_encoder = CrossEncoder(RERANKER_MODEL)
+    return _cross_encoder
+
+
+def rerank(query, rows, top_n, method=RERANKER):
+    """Return the top_n rows after rescoring with the configured method."""
+    if method == "none" or len(rows) <= 1:
+        return rows[:top_n]
+
+    if method == "cross-encoder":
+        scores = list(get_cross_encoder().predict([(query, row) for row in rows]))
+    else:
+        bm25 = lexical_scores(query, rows)
+        top = max(bm25) or 1.0
+        n = len(rows)
+        # Keep some of the dense ordering so rows with no term overlap stay sensible
+        scores = [
+            (1 - DENSE_WEIGHT) * (s / top) + DENSE_WEIGHT * (1 - rank / n)
+            for rank, s in enumerate(bm25)
+        ]
+
+    order = sorted(range(len(rows)), key=lambda i: scores[i], reverse=True)
+    return [rows[i] for i in order[:top_n]]
+
+
+def retrieve_ranked(query, k, candidates=RAG_CANDIDATES, method=RERANKER):
+    """Fetch `candidates` rows from FAISS, rerank, keep the best k."""
+    if method == "none":
+        return retriever.retrieve_semantic_results(query, k=k)
+    rows = retriever.retrieve_semantic_results(query, k=max(k, candidates))
+    return rerank(query, rows, k, method)
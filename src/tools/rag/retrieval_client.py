@@ -0,0 +1,87 @@
+"""
+Retrieval Client — thin client for the standalone retrieval server
+-----------------------------------------------------------------
+Used by retrieve_semantic_results when RETRIEVAL_SERVER_URL is set.
+Speaks plain HTTP/JSON over TCP ("http://host:port") or a Unix socket
+("unix:///path/to.sock"), keeping one connection per thread.
+"""
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlparse
+
+from src.config.settings import RETRIEVAL_SERVER_URL, RETRIEVAL_SERVER_TIMEOUT
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class RetrievalClient:
+    def __init__(self, url, timeout):
+        self.url = urlparse(url)
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            if self.url.scheme == "unix":
+                conn = UnixHTTPConnection(self.url.path, self.timeout)
+            else:
+                conn = http.client.HTTPConnection(self.url.hostname, self.url.port or 80, timeout=self.timeout)
+            self.local.conn = conn
+        return conn
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+
+        # Retry once on a stale keep-alive connection
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    raise
+
+        if response.status != 200:
+            raise RuntimeError(f"retrieval server returned {response.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    def search(self, queries, k):
+        """Top-k rows for each query."""
+        return self._request("POST", "/search", {"queries": list(queries), "k": k})["results"]
+
+    def health(self):
+        return self._request("GET", "/health")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = RetrievalClient(RETRIEVAL_SERVER_URL, RETRIEVAL_SERVER_TIMEOUT)
+    return _client
@@ -0,0 +1,192 @@
+"""
+Retrieval Server — standalone embedding + FAISS search process
+--------------------------------------------------------------
+Owns the embedder and the FAISS index so web workers don't have to. Requests
+arriving within a few milliseconds of each other are merged into one batch:
+one encoder pass and one FAISS search for all of them.
+
+Point the web app at it with RETRIEVAL_SERVER_URL.
+
+Run:
+    python -m src.tools.rag.retrieval_server --port 8700
+    python -m src.tools.rag.retrieval_server --unix-socket /tmp/medical-rag.sock
+
+API:
+    POST /search  {"queries": ["..."], "k": 3}  ->  {"results": [["row", ...], ...]}
+    GET  /health
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from src.config.settings import RETRIEVAL_MAX_BATCH, RETRIEVAL_BATCH_WAIT_MS
+from src.tools.rag.retriever import index_manager, search_many
+
+
+class PendingSearch:
+    def __init__(self, queries, k):
+        self.queries = queries
+        self.k = k
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class SearchBatcher:
+    """Collects concurrent searches and runs them as a single batch."""
+
+    def __init__(self, index, max_batch, max_wait):
+        self.index = index
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.pending = queue.Queue()
+        self.batches = 0
+        self.queries = 0
+        threading.Thread(target=self._run, name="search-batcher", daemon=True).start()
+
+    def search(self, queries, k, timeout=30):
+        item = PendingSearch(queries, k)
+        self.pending.put(item)
+        if not item.done.wait(timeout):
+            raise TimeoutError("search timed out")
+        if item.error:
+            raise item.error
+        return item.results
+
+    def _collect(self):
+        batch = [self.pending.get()]
+        size = len(batch[0].queries)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item.queries)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            all_queries = [q for item in batch for q in item.queries]
+            max_k = max(item.k for item in batch)
+            try:
+                # A hot-reloaded index takes over between batches
+                with self.index.acquire() as db:
+                    rows = search_many(db, all_queries, max_k)
+                offset = 0
+                for item in batch:
+                    item.results = [r[:item.k] for r in rows[offset:offset + len(item.queries)]]
+                    offset += len(item.queries)
+            except Exception as e:
+                for item in batch:
+                    item.error = e
+            self.batches += 1
+            self.queries += len(all_queries)
+            for item in batch:
+                item.done.set()
+
+
+def make_handler(batcher):
+
+    class RetrievalHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json({
+                    "status": "ok",
+                    "index": batcher.index.snapshot(),
+                    "batches": batcher.batches,
+                    "queries": batcher.queries,
+                })
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            if self.path != "/search":
+                self._send_json({"error": "not found"}, status=404)
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                queries = payload["queries"]
+                k = int(payload.get("k", 3))
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json({"error": f"bad request: {e}"}, status=400)
+                return
+
+            try:
+                self._send_json({"results": batcher.search(queries, k)})
+            except Exception as e:
+                print(f"❌ Retrieval server error: {e}")
+                self._send_json({"error": str(e)}, status=500)
+
+    return RetrievalHandler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Standalone retrieval server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--unix-socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=RETRIEVAL_MAX_BATCH)
+    parser.add_argument("--batch-wait-ms", type=float, default=RETRIEVAL_BATCH_WAIT_MS)
+    args = parser.parse_args()
+
+    print("🔄 Loading embedder and FAISS index...")
+    db = index_manager.current().db
+    print(f"✅ Index ready ({db.index.ntotal} vectors)")
+
+    batcher = SearchBatcher(index_manager, args.max_batch, args.batch_wait_ms / 1000)
+    handler = make_handler(batcher)
+
+    if args.unix_socket:
+        if os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+        server = ThreadingUnixHTTPServer(args.unix_socket, handler)
+        print(f"🧠 Retrieval server on unix://{args.unix_socket}")
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        server.daemon_threads = True
+        print(f"🧠 Retrieval server on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping retrieval server")
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,189 @@
 import sys
 import os
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from datasets import load_dataset
-from langchain_community.vectorstores import FAISS
 from tools.rag.embedder import get_embedder
-from config.settings import DATASET_NAME, FAISS_DB_PATH
+from tools.rag.multivector import ParentIndex, row_text, similarity_scores
+from tools.rag.index_manager import IndexManager, new_version_dir, publish_version, resolve_index
+from config.settings import DATASET_NAME, FAISS_DB_PATH, FAISS_MMAP, RETRIEVAL_SERVER_URL, RETRIEVAL_FALLBACK_LOCAL
+from config.settings import INDEX_MODE, SYMPTOM_GROUP_SIZE, MULTI_VECTOR_FANOUT, MULTI_VECTOR_SUM_WEIGHT
+from config.settings import EMBED_MODEL, INDEX_WATCH_SECONDS, INDEX_KEEP_VERSIONS
 
+# datasets, langchain_community and sentence-transformers are heavy to import,
+# so they are loaded on first use rather than at module import.
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
 
 
 def build_faiss_index():
     """Build FAISS index from dataset for disease-symptom retrieval."""
+    from datasets import load_dataset
+    from langchain_community.vectorstores import FAISS
+
     print("📥 Loading dataset...")
     ds = load_dataset(DATASET_NAME, split="train")
 
-    docs = []
+    rows = []
     for row in ds:
         disease = row.get("Disease", "")
         symptoms = row.get("Symptoms", "")
         treatments = row.get("Treatments", "")
+        rows.append((disease, symptoms, treatments))
 
-        text = (
-            f"Disease: {disease}\n"
-            f"Symptoms: {symptoms}\n"
-            f"Treatments: {treatments}"
-        )
-        docs.append(text)
-
-    print(f"✅ Loaded {len(docs)} records")
+    print(f"✅ Loaded {len(rows)} records")
     embeddings = get_embedder()
 
+    if INDEX_MODE == "multi":
+        build_multi_vector_index(rows, embeddings, FAISS_DB_PATH, SYMPTOM_GROUP_SIZE)
+        return
+
+    docs = [row_text(*row) for row in rows]
+
+    # Each build goes into a new version directory; running processes
+    # pick it up once the manifest points at it
+    version, path = new_version_dir(FAISS_DB_PATH)
     print("🔧 Building FAISS index...")
     db = FAISS.from_texts(docs, embedding=embeddings)
-    db.save_local(FAISS_DB_PATH)
-    print(f"✅ Index saved at: {FAISS_DB_PATH}")
+    db.save_local(path)
+    print(f"✅ Index saved at: {path}")
+    publish_version(FAISS_DB_PATH, version, keep=INDEX_KEEP_VERSIONS,
+                    mode="row", rows=len(rows), vectors=db.index.ntotal, embed_model=EMBED_MODEL)
+
+
+def build_multi_vector_index(rows, embeddings, root, group_size=SYMPTOM_GROUP_SIZE):
+    """One vector per symptom group and per treatment field, mapped back to the parent row."""
+    from langchain_community.vectorstores import FAISS
+
+    texts, parents = ParentIndex.from_rows(rows, group_size)
+    version, path = new_version_dir(root)
+    print(f"🔧 Building multi-vector FAISS index ({len(texts)} vectors for {len(rows)} rows)...")
+    db = FAISS.from_texts(texts, embedding=embeddings)
+    db.save_local(path)
+    parents.save(path)
+    print(f"✅ Index saved at: {path}")
+    publish_version(root, version, keep=INDEX_KEEP_VERSIONS,
+                    mode="multi", rows=len(rows), vectors=db.index.ntotal, embed_model=EMBED_MODEL)
+
+
+def load_vectorstore(embeddings, path=FAISS_DB_PATH, mmap=FAISS_MMAP):
+    """
+    Load the saved FAISS index and docstore from disk. `path` may be a
+    versioned index root, in which case its current version is loaded.
+    With mmap=True the vectors are memory-mapped from index.faiss, so every
+    process using the same file shares one copy through the page cache.
+    A multi-vector index also gets its child -> parent map (db.parent_index).
+    """
+    from langchain_community.vectorstores import FAISS
+
+    _, path = resolve_index(path)
+    db = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+    if mmap:
+        import faiss
+        flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        db.index = faiss.read_index(os.path.join(path, "index.faiss"), flag)
+    db.parent_index = ParentIndex.load(path)
+    return db
+
+
+def get_shared_embedder():
+    """One embedder per process, reused by every index version."""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = get_embedder()
+    return _embeddings
+
+
+def load_index_version(path):
+    """Load one index version and run a search on it, so the first real query isn't slow."""
+    import numpy as np
+
+    db = load_vectorstore(get_shared_embedder(), path)
+    search_vectors(db, np.zeros((1, db.index.d), dtype="float32"), 1)
+    return db
+
+
+index_manager = IndexManager(FAISS_DB_PATH, load_index_version, INDEX_WATCH_SECONDS)
+
+
+def get_vectorstore():
+    """
+    Return the live vectorstore, loading embedder and index on first use.
+    Hold index_manager.acquire() instead when a new version must not be
+    released mid-search.
+    """
+    return index_manager.current().db
+
+
+def is_loaded():
+    return index_manager.is_loaded()
+
+
+def search_many(db, queries, k):
+    """
+    Batched retrieval: encode all queries in one pass and run a single
+    FAISS search for the whole batch. Returns one list of rows per query.
+    """
+    import numpy as np
+
+    vectors = np.asarray(db.embedding_function.embed_documents(list(queries)), dtype="float32")
+    if db._normalize_L2:
+        import faiss
+        faiss.normalize_L2(vectors)
+
+    return search_vectors(db, vectors, k)
+
+
+def search_vectors(db, vectors, k):
+    """
+    Rows for each query vector. On a multi-vector index, k * MULTI_VECTOR_FANOUT
+    children are fetched and folded into k parent rows, one per disease.
+    """
+    parent_index = getattr(db, "parent_index", None)
+    if parent_index is not None:
+        distances, child_ids = db.index.search(vectors, k * MULTI_VECTOR_FANOUT)
+        scores = similarity_scores(db.index, distances)
+        return parent_index.top_rows(scores, child_ids, k, MULTI_VECTOR_SUM_WEIGHT)
+
+    _, indices = db.index.search(vectors, k)
+
+    rows = []
+    for row_ids in indices:
+        docs = []
+        for i in row_ids:
+            if i == -1:
+                continue
+            doc = db.docstore.search(db.index_to_docstore_id[i])
+            docs.append(doc.page_content)
+        rows.append(docs)
+    return rows
+
+
+def warm_up_retriever():
+    """Load the local embedder/index, or check the retrieval server is reachable."""
+    if RETRIEVAL_SERVER_URL:
+        from src.tools.rag.retrieval_client import get_client
+        get_client().health()
+        return
+    get_vectorstore()
 
 
 def retrieve_semantic_results(query: str, k: int = 3):
     """Retrieve semantically similar medical entries from FAISS."""
-    embeddings = get_embedder()
-    db = FAISS.load_local(FAISS_DB_PATH, embeddings, allow_dangerous_deserialization=True)
-    results = db.similarity_search(query, k=k)
-    return [r.page_content for r in results]
+    if RETRIEVAL_SERVER_URL:
+        from src.tools.rag.retrieval_client import get_client
+        try:
+            return get_client().search([query], k)[0]
+        except Exception as e:
+            if not RETRIEVAL_FALLBACK_LOCAL:
+                raise
+            print(f"⚠️ Retrieval server unavailable ({e}), falling back to local index")
+
+    with index_manager.acquire() as db:
+        return search_many(db, [query], k)[0]
 
 
 if __name__ == "__main__":
     build_faiss_index()
-
@@ -0,0 +1,147 @@
+"""
+EuropePMC Client — compact paper records with lazy cursor paging
+----------------------------------------------------------------
+Europe PMC's REST search has no per-field selection; the closest knob is
+resultType: "lite" (bibliographic fields only) or "core" (adds abstracts
+and much more). This client asks for "core" only when abstracts are
+wanted, caps how many bytes it will download per page (falling back to
+"lite" if the cap is hit), keeps only the fields the agent uses, and
+follows nextCursorMark lazily when more papers are requested.
+"""
+import json
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import requests
+
+from src.config.settings import (
+    EUROPEPMC_URL,
+    EUROPEPMC_TIMEOUT,
+    EUROPEPMC_MAX_BYTES,
+    RESEARCH_ABSTRACT_CHARS,
+)
+from src.runtime.admission import tool_slot
+from src.runtime.breaker import get_breaker
+from src.tools.results import ToolResult
+from src.tools.fetch import PayloadTooLarge, read_body, read_timeout
+
+# Europe PMC caps pageSize at 1000; small pages keep responses light
+MAX_PAGE_SIZE = 100
+
+
+@dataclass(slots=True)
+class Paper:
+    title: str
+    authors: str
+    journal: str
+    year: str
+    pmid: str
+    doi: str
+    abstract: Optional[str]
+
+    @classmethod
+    def from_api(cls, record, abstract_chars=RESEARCH_ABSTRACT_CHARS):
+        abstract = record.get("abstractText")
+        if abstract and len(abstract) > abstract_chars:
+            abstract = abstract[:abstract_chars] + "..."
+        return cls(
+            title=record.get("title", "No title"),
+            authors=record.get("authorString", "Unknown authors"),
+            journal=record.get("journalTitle", "Unknown journal"),
+            year=record.get("pubYear", "Unknown year"),
+            pmid=record.get("pmid", ""),
+            doi=record.get("doi", ""),
+            abstract=abstract,
+        )
+
+    def to_result(self):
+        return ToolResult(
+            source="research",
+            title=self.title,
+            meta=f"Authors: {self.authors}\nJournal: {self.journal} ({self.year})",
+            pmid=self.pmid,
+            doi=self.doi,
+            snippet=f"Abstract: {self.abstract or 'No abstract available'}",
+        )
+
+
+class EuropePMCClient:
+    def __init__(self, base_url=EUROPEPMC_URL, timeout=EUROPEPMC_TIMEOUT, max_bytes=EUROPEPMC_MAX_BYTES):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+
+    def _download(self, params, timeout=None):
+        """
+        GET one page, refusing to read more than max_bytes. `timeout` bounds
+        the whole download, and the provider slot is held until the body is read.
+        """
+        # Waiting for the slot is charged to the timeout too
+        deadline = time.monotonic() + (timeout or self.timeout)
+        # The breaker only times the provider call, not the wait for our own slot
+        with tool_slot("europepmc", max_wait=deadline - time.monotonic()):
+            with get_breaker("europepmc").guard(ignore=(PayloadTooLarge,)):
+                response = self.session.get(self.base_url, params=params, timeout=read_timeout(deadline), stream=True)
+                try:
+                    response.raise_for_status()
+                    body = read_body(response, deadline, self.max_bytes)
+                finally:
+                    response.close()
+        return json.loads(body)
+
+    def fetch_page(self, query, page_size, cursor="*", with_abstracts=True, timeout=None):
+        """
+        One page of results. Returns (papers, next_cursor, hit_count);
+        next_cursor is None on the last page.
+        """
+        params = {
+            "query": query,
+            "format": "json",
+            "pageSize": min(page_size, MAX_PAGE_SIZE),
+            "cursorMark": cursor,
+            "resultType": "core" if with_abstracts else "lite",
+        }
+        try:
+            data = self._download(params, timeout)
+        except PayloadTooLarge:
+            if not with_abstracts:
+                raise
+            print("⚠️ Research: core payload too large, retrying without abstracts")
+            params["resultType"] = "lite"
+            data = self._download(params, timeout)
+
+        records = data.get("resultList", {}).get("result", [])
+        papers = [Paper.from_api(r) for r in records]
+        next_cursor = data.get("nextCursorMark")
+        if not records or next_cursor == cursor:
+            next_cursor = None
+        return papers, next_cursor, data.get("hitCount", 0)
+
+    def iter_papers(self, query, page_size=5, with_abstracts=True, timeout=None) -> Iterator[Paper]:
+        """Yield papers page by page; the next page is only requested when needed."""
+        cursor = "*"
+        while cursor is not None:
+            papers, cursor, _ = self.fetch_page(query, page_size, cursor, with_abstracts, timeout)
+            yield from papers
+
+    def search(self, query, limit=5, with_abstracts=True, timeout=None) -> List[Paper]:
+        """Up to `limit` papers, paging as needed. `timeout` (per request) defaults to the client's."""
+        papers = []
+        pages = self.iter_papers(query, page_size=min(limit, MAX_PAGE_SIZE), with_abstracts=with_abstracts, timeout=timeout)
+        for paper in pages:
+            papers.append(paper)
+            if len(papers) >= limit:
+                break
+        return papers
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = EuropePMCClient()
+    return _client
@@ -1,95 +1,72 @@
 import os
 import requests
 from typing import Dict
+from src.config.settings import RESEARCH_MAX_PAPERS, EUROPEPMC_TIMEOUT
+from src.runtime.admission import Overloaded
+from src.runtime.breaker import CircuitOpen
+from src.runtime.clients import clients
+from src.tools.results import ToolResult
+from src.runtime.singleflight import tool_flights
+from src.runtime.budget import tool_timeout
 
 
 def research_agent(state: Dict) -> Dict:
     """
     Searches EuropePMC for research papers.
+    Set state["metadata"]["max_papers"] to pull more than RESEARCH_MAX_PAPERS;
+    extra pages are fetched only as needed.
     """
     query = state.get("query", "")
+    limit = (state.get("metadata") or {}).get("max_papers", RESEARCH_MAX_PAPERS)
     print(f"🔍 Searching EuropePMC for: {query}")
 
-    # EuropePMC API endpoint
-    base_url = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
-
-    params = {
-        "query": query,
-        "format": "json",
-        "pageSize": 5,
-        "cursorMark": "*"
-    }
-
     try:
-        print(f"🔍 Debug - Making request to EuropePMC...")
-        response = requests.get(base_url, params=params, timeout=10)
-        print(f"🔍 Debug - Status code: {response.status_code}")
-
-        response.raise_for_status()
-        data = response.json()
+        # Identical concurrent searches share one EuropePMC request
+        papers = tool_flights.do(
+            ("europepmc", query, limit), clients.europepmc().search, query,
+            limit=limit, timeout=tool_timeout(state, EUROPEPMC_TIMEOUT)
+        )
 
-        print(f"🔍 Debug - Response keys: {data.keys()}")
-        print(f"🔍 Debug - Hit count: {data.get('hitCount', 0)}")
-
-        # Extract results
-        results_list = data.get("resultList", {}).get("result", [])
-        print(f"🔍 Debug - Results list length: {len(results_list)}")
-
-        if not results_list:
+        if not papers:
             print("⚠️ Research: No papers found")
             return {
                 **state,
-                "results": [f"No research papers found for '{query}'. Try more specific medical terms."]
+                "results": [ToolResult.notice("research", f"No research papers found for '{query}'. Try more specific medical terms.")]
             }
 
-        # Format results
-        formatted_results = []
-        for paper in results_list[:5]:
-            title = paper.get("title", "No title")
-            authors = paper.get("authorString", "Unknown authors")
-            journal = paper.get("journalTitle", "Unknown journal")
-            pub_year = paper.get("pubYear", "Unknown year")
-            doi = paper.get("doi", "")
-            pmid = paper.get("pmid", "")
-            abstract = paper.get("abstractText", "No abstract available")
-
-            # Truncate abstract if too long
-            if len(abstract) > 300:
-                abstract = abstract[:300] + "..."
-
-            result_str = f"""**{title}**
-Authors: {authors}
-Journal: {journal} ({pub_year})
-PMID: {pmid}
-DOI: {doi}
-
-Abstract: {abstract}
-"""
-            formatted_results.append(result_str)
+        formatted_results = [paper.to_result() for paper in papers]
 
         print(f"✅ Research: Found {len(formatted_results)} papers")
 
-        # CRITICAL: Add debug before returning
-        return_dict = {
+        return {
             **state,
             "results": formatted_results
         }
-        print(f"🔍 Debug - Returning {len(return_dict['results'])} results")
 
-        return return_dict
+    except CircuitOpen as e:
+        print(f"🔌 Research: {e}")
+        return {
+            **state,
+            "results": [ToolResult.notice("research", "EuropePMC is temporarily unavailable. Please try again later.")]
+        }
+
+    except Overloaded as e:
+        # Shed, not failed: /chat answers 503 with Retry-After (multi_executor keeps the other tools)
+        print(f"⏳ Research: Shed by rate limiter - {e}")
+        raise
 
     except requests.exceptions.Timeout:
         print("❌ Research: Request timeout")
         return {
             **state,
-            "results": ["EuropePMC request timed out. Please try again."]
+            "results": [ToolResult.notice("research", "EuropePMC request timed out. Please try again.")]
         }
 
     except requests.exceptions.RequestException as e:
         print(f"❌ Research: Request error - {e}")
         return {
             **state,
-            "results": [f"Error searching EuropePMC: {str(e)}"]
+            "results": [ToolResult.notice("research", f"Error searching EuropePMC: {str(e)}")]
         }
 
     except Exception as e:
@@ -98,7 +75,7 @@ Abstract: {abstract}
         traceback.print_exc()
         return {
             **state,
-            "results": [f"Error processing research papers: {str(e)}"]
+            "results": [ToolResult.notice("research", f"Error processing research papers: {str(e)}")]
         }
 
 
@@ -114,4 +91,4 @@ if __name__ == "__main__":
     result = research_agent(test_state)
     print("\n📚 Research Results:\n")
     for i, paper in enumerate(result["results"], 1):
-        print(f"\n{i}. {paper}")
\ No newline at end of file
+        print(f"\n{i}. {paper.to_text()}")
\ No newline at end of file
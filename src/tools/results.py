@@ -0,0 +1,85 @@
+"""
+Tool Results — the record every tool puts in state["results"]
+-------------------------------------------------------------
+Tools return ToolResult objects instead of pre-formatted strings, so the
+aggregator (and anything between tools and aggregator) can group, dedupe
+and rank on fields. Text is only rendered once, when the prompt is built.
+
+kind:
+    document  a retrieved item (paper, web page, knowledge-base row)
+    answer    text already written by an LLM (e.g. the RAG agent's answer)
+    notice    status or error message ("no papers found", "timed out", ...)
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+SOURCE_LABELS = {
+    "rag": "MEDICAL KNOWLEDGE BASE",
+    "research": "RESEARCH PAPERS",
+    "websearch": "WEB NEWS",
+}
+
+
+@dataclass(slots=True)
+class ToolResult:
+    source: str
+    snippet: str
+    title: str = ""
+    meta: str = ""
+    url: str = ""
+    pmid: str = ""
+    doi: str = ""
+    score: Optional[float] = None
+    kind: str = "document"
+
+    @classmethod
+    def notice(cls, source, message):
+        return cls(source=source, snippet=message, kind="notice")
+
+    def to_text(self):
+        if self.kind != "document":
+            return self.snippet
+
+        lines = [f"**{self.title}**"] if self.title else []
+        if self.meta:
+            lines.append(self.meta)
+        if self.pmid:
+            lines.append(f"PMID: {self.pmid}")
+        if self.doi:
+            lines.append(f"DOI: {self.doi}")
+        if self.url:
+            lines.append(f"Source: {self.url}")
+        if self.snippet:
+            lines.append("")
+            lines.append(self.snippet)
+        return "\n".join(lines)
+
+
+def notices(results):
+    """Messages of the notice results (errors, sheds, "nothing found")."""
+    return [r.snippet for r in results if isinstance(r, ToolResult) and r.kind == "notice"]
+
+
+def render_results(results):
+    """
+    Prompt context: results grouped by source under a header, in the order
+    sources first appear. Plain strings are passed through unchanged.
+    """
+    groups = {}
+    for r in results:
+        source = r.source if isinstance(r, ToolResult) else "other"
+        groups.setdefault(source, []).append(r)
+
+    if len(groups) == 1:
+        return "\n\n".join(_text(r) for r in results)
+
+    sections = []
+    for source, items in groups.items():
+        label = SOURCE_LABELS.get(source, source.upper())
+        body = "\n\n".join(_text(r) for r in items)
+        sections.append(f"{'=' * 60}\n📋 {label}\n{'=' * 60}\n{body}")
+    return "\n\n".join(sections)
+
+
+def _text(result):
+    return result.to_text() if isinstance(result, ToolResult) else str(result)
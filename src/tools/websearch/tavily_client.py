@@ -0,0 +1,65 @@
+"""
+Tavily Client — search over one pooled session, with a real deadline
+--------------------------------------------------------------------
+langchain_tavily posts every search with a bare requests.post and no
+timeout, so a hung call could only be abandoned, never stopped, and each
+search opened a new connection. This client keeps one requests.Session per
+process and bounds the whole call (connect, headers and body) by the
+caller's timeout.
+"""
+import json
+import os
+import time
+
+import requests
+
+from src.config.settings import TAVILY_API_BASE_URL, TAVILY_TIMEOUT
+from src.tools.fetch import read_body, read_timeout
+
+TAVILY_API_URL = "https://api.tavily.com"
+
+
+class TavilyClient:
+    def __init__(self, api_key=None, base_url=None, timeout=TAVILY_TIMEOUT, max_results=5):
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self.base_url = (base_url or TAVILY_API_BASE_URL or TAVILY_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_results = max_results
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        })
+
+    def search(self, query, timeout=None):
+        """Tavily /search response ({"results": [...], "answer": ...}); raises on HTTP errors."""
+        deadline = time.monotonic() + (timeout or self.timeout)
+        response = self.session.post(
+            f"{self.base_url}/search",
+            json={"query": query, "max_results": self.max_results},
+            timeout=read_timeout(deadline),
+            stream=True,
+        )
+        try:
+            body = read_body(response, deadline)
+        finally:
+            response.close()
+
+        if response.status_code != 200:
+            try:
+                detail = json.loads(body).get("detail")
+            except ValueError:
+                detail = None
+            message = detail.get("error") if isinstance(detail, dict) else body[:200].decode("utf-8", "replace")
+            raise RuntimeError(f"Tavily error {response.status_code}: {message}")
+        return json.loads(body)
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = TavilyClient()
+    return _client
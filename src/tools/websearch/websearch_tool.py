@@ -1,5 +1,26 @@
 import os
-from langchain_tavily import TavilySearch
+import time
+
+import requests
+
+from src.config.settings import TAVILY_TIMEOUT
+from src.runtime.admission import tool_slot, Overloaded
+from src.runtime.breaker import get_breaker, CircuitOpen
+from src.tools.results import ToolResult
+from src.runtime.singleflight import tool_flights
+from src.runtime.budget import tool_timeout
+from src.runtime.clients import clients
+
+
+def to_result(item):
+    """One Tavily search hit as a ToolResult."""
+    return ToolResult(
+        source="websearch",
+        title=item.get('title', 'No title'),
+        snippet=item.get('content', 'No content'),
+        url=item.get('url', ''),
+        score=item.get('score'),
+    )
 
 
 def websearch_tool(state):
@@ -10,15 +31,25 @@ def websearch_tool(state):
         print("❌ WebSearch: TAVILY_API_KEY not found")
         return {
             **state,
-            "results": ["Tavily API key not configured."]
+            "results": [ToolResult.notice("websearch", "Tavily API key not configured.")]
         }
 
-    tavily = TavilySearch(tavily_api_key=api_key)
-
     print(f"🔍 WebSearch: Searching for '{query}'")
+    timeout = tool_timeout(state, TAVILY_TIMEOUT)
+
+    def search():
+        # Waiting for the slot is charged to the timeout; the call gets what is left
+        deadline = time.monotonic() + timeout
+        # The slot is held until the call has really finished (the client's
+        # deadline covers connect, headers and body), so the limiter sees hung calls.
+        # The breaker sits inside it: waiting on our own limits is not a slow provider
+        with tool_slot("tavily", max_wait=timeout):
+            with get_breaker("tavily").guard():
+                return clients.tavily().search(query, timeout=max(deadline - time.monotonic(), 0.01))
 
     try:
-        raw_result = tavily.run(query)
+        # Identical concurrent searches share one Tavily call (and one breaker outcome)
+        raw_result = tool_flights.do(("tavily", query), search)
 
         # Debug: Print the raw structure
         print(f"🔍 Debug - Raw result type: {type(raw_result)}")
@@ -29,7 +60,7 @@ def websearch_tool(state):
 
         # Case 1: If it's already a formatted string
         if isinstance(raw_result, str):
-            formatted_results = [raw_result]
+            formatted_results = [ToolResult(source="websearch", snippet=raw_result, kind="answer")]
 
         # Case 2: If it's a list of dicts (common Tavily format)
         elif isinstance(raw_result, list):
@@ -38,27 +69,18 @@ def websearch_tool(state):
                     # Check if it has nested 'results' key
                     if 'results' in item:
                         for result in item['results'][:5]:
-                            title = result.get('title', 'No title')
-                            content = result.get('content', 'No content')
-                            url = result.get('url', '')
-                            formatted_results.append(f"**{title}**\n{content}\nSource: {url}")
+                            formatted_results.append(to_result(result))
                     # Or if item itself is a result
                     else:
-                        title = item.get('title', 'No title')
-                        content = item.get('content', 'No content')
-                        url = item.get('url', '')
-                        formatted_results.append(f"**{title}**\n{content}\nSource: {url}")
+                        formatted_results.append(to_result(item))
 
         # Case 3: If it's a dict
         elif isinstance(raw_result, dict):
             if 'results' in raw_result:
                 for result in raw_result['results'][:5]:
-                    title = result.get('title', 'No title')
-                    content = result.get('content', 'No content')
-                    url = result.get('url', '')
-                    formatted_results.append(f"**{title}**\n{content}\nSource: {url}")
+                    formatted_results.append(to_result(result))
             elif 'answer' in raw_result:
-                formatted_results = [raw_result['answer']]
+                formatted_results = [ToolResult(source="websearch", snippet=raw_result['answer'], kind="answer")]
 
         if formatted_results:
             print(f"✅ WebSearch: Found {len(formatted_results)} results")
@@ -70,14 +92,33 @@ def websearch_tool(state):
             print("⚠️ WebSearch: No results found in response")
             return {
                 **state,
-                "results": ["No recent medical news found. Try rephrasing your query."]
+                "results": [ToolResult.notice("websearch", "No recent medical news found. Try rephrasing your query.")]
             }
 
+    except CircuitOpen as e:
+        print(f"🔌 WebSearch: {e}")
+        return {
+            **state,
+            "results": [ToolResult.notice("websearch", "Web search is temporarily unavailable. Please try again later.")]
+        }
+
+    except (TimeoutError, requests.exceptions.Timeout):
+        print("❌ WebSearch: Request timeout")
+        return {
+            **state,
+            "results": [ToolResult.notice("websearch", "Web search timed out. Please try again.")]
+        }
+
+    except Overloaded as e:
+        # Shed, not failed: /chat answers 503 with Retry-After (multi_executor keeps the other tools)
+        print(f"⏳ WebSearch: Shed by rate limiter - {e}")
+        raise
+
     except Exception as e:
         print(f"❌ WebSearch Error: {e}")
         import traceback
         traceback.print_exc()
         return {
             **state,
-            "results": [f"Error searching: {str(e)}"]
+            "results": [ToolResult.notice("websearch", f"Error searching: {str(e)}")]
         }
\ No newline at end of file
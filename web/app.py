@@ -5,6 +5,8 @@ Optimized for Render deployment
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import sqlite3
+import uuid
+import html
 from datetime import datetime
 import os
 import sys
@@ -12,8 +14,15 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Import your graph
-from src.langgraph.graph import build_graph
+# Light imports only: the graph, LLM clients and embedder load in AssistantService.warm_up()
+from src.config.settings import WARMUP_ON_START, GRAPH_WAIT_SECONDS, SERVE_PRECOMPUTED
+from src.runtime.admission import admission, Overloaded, tool_limits_snapshot
+from src.runtime.breaker import breaker_states
+from src.runtime.singleflight import graph_flights, normalize_query, coalescing_snapshot
+from src.runtime.answer_store import answer_store
+from src.runtime.budget import new_deadline
+from src.service import get_service
+from src.runtime.profiler import RequestProfiler, should_profile, token_ok, valid_request_id, read_profile
 
 # Initialize Flask app with static files
 app = Flask(__name__, static_folder='static', static_url_path='')
@@ -23,7 +32,8 @@ CORS(app, resources={
     r"/*": {
         "origins": "*",  # Change to specific domain in production
         "methods": ["GET", "POST", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type", "X-Profile", "X-Profile-Token", "X-Request-ID"],
+        "expose_headers": ["X-Request-ID"]
     }
 })
 
@@ -33,6 +43,9 @@ PORT = int(os.environ.get('PORT', 8000))
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'chat_history.db')
 
+# Set by init_db(); False if this SQLite build lacks FTS5 (search falls back to LIKE)
+FTS_ENABLED = False
+
 def init_db():
     """Initialize SQLite database"""
     try:
@@ -65,22 +78,106 @@ def init_db():
         ''')
 
         conn.commit()
+        init_message_search(conn)
         conn.close()
         print("✅ Database initialized")
     except Exception as e:
         print(f"❌ Database init error: {e}")
 
+def init_message_search(conn):
+    """
+    Full-text index over messages: an FTS5 table that reads its text from
+    `messages` (external content), kept in sync by triggers. Databases created
+    before the index existed are backfilled once.
+    """
+    global FTS_ENABLED
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'")
+        exists = cursor.fetchone() is not None
+
+        cursor.executescript('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                message,
+                content='messages',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts(rowid, message) VALUES (new.id, new.message);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF message ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+                INSERT INTO messages_fts(rowid, message) VALUES (new.id, new.message);
+            END;
+        ''')
+
+        if not exists:
+            # Backfill messages written before the index existed
+            cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            cursor.execute("SELECT COUNT(*) FROM messages")
+            print(f"✅ Search index built for {cursor.fetchone()[0]} existing messages")
+
+        conn.commit()
+        FTS_ENABLED = True
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ Full-text search unavailable, using LIKE: {e}")
+
+# snippet() marks matches with these private-use characters; highlight_snippet()
+# escapes the message text first and only then turns them into <mark> tags
+MARK_START, MARK_END = '\ue000', '\ue001'
+
+def highlight_snippet(snippet):
+    """HTML-safe snippet: stored text escaped, matches wrapped in <mark>"""
+    return html.escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+def fts_query(text):
+    """
+    User input as an FTS5 query: every word must match, the last one as a
+    prefix (search-as-you-type). Words are quoted so punctuation is never
+    parsed as FTS syntax.
+    """
+    words = text.split()
+    terms = ['"' + w.replace('"', '""') + '"' for w in words]
+    if terms:
+        terms[-1] += '*'
+    return " ".join(terms)
+
 # Initialize on startup
 print("🔄 Initializing...")
 init_db()
 
-print("🔄 Building LangGraph...")
-try:
-    graph = build_graph()
-    print("✅ Graph ready")
-except Exception as e:
-    print(f"❌ Graph error: {e}")
-    graph = None
+# Compiled graph, LLM clients, embedder and index, shared by every request
+service = get_service()
+
+
+def index_snapshot():
+    """Live FAISS index version and readers (None until the retriever is imported)"""
+    retriever = sys.modules.get("src.tools.rag.retriever")
+    return retriever.index_manager.snapshot() if retriever else None
+
+
+def start_warm_up():
+    """Build the graph and warm the retriever on a background thread (once per process)"""
+    service.start(background=True)
+
+
+def preload_models():
+    """
+    Warm up synchronously, e.g. in the gunicorn master before fork,
+    so workers inherit the graph, embedder and index copy-on-write.
+    """
+    service.start()
+
+
+if WARMUP_ON_START:
+    start_warm_up()
 
 # Serve frontend
 @app.route('/')
@@ -98,12 +195,21 @@ def serve_static(path):
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness + per-component readiness)"""
     return jsonify({
         "status": "healthy",
         "message": "Medical AI API is running",
-        "graph_loaded": graph is not None,
-        "port": PORT
+        "ready": all(state == "ready" for state in service.components.values()),
+        "components": service.components,
+        "graph_loaded": service.graph is not None,
+        "pid": os.getpid(),
+        "port": PORT,
+        "admission": admission.snapshot(),
+        "tool_limits": tool_limits_snapshot(),
+        "circuit_breakers": breaker_states(),
+        "coalescing": coalescing_snapshot(),
+        "answer_store": answer_store.snapshot(),
+        "index": index_snapshot()
     })
 
 @app.route('/chat', methods=['POST'])
@@ -117,21 +223,41 @@ def chat():
         if not query:
             return jsonify({"error": "Query is required"}), 400
 
-        if not graph:
-            return jsonify({"error": "AI model not initialized"}), 500
-
         print(f"📨 Query: {query[:50]}...")
 
-        # Run through graph
-        initial_state = {
-            "query": query,
-            "tool": "",
-            "results": [],
-            "metadata": {},
-            "final_answer": ""
-        }
-
-        result = graph.invoke(initial_state)
+        # The latency budget starts now, so queueing for admission counts against it
+        deadline = new_deadline()
+
+        profiled = should_profile(request.headers.get("X-Profile") or request.args.get("profile"),
+                                  request.headers.get("X-Profile-Token"))
+        # A profile is stored under the request id, so a profiled request always gets a
+        # fresh one; a client-chosen id could overwrite (or point at) someone else's profile
+        request_id = request.headers.get("X-Request-ID", "")
+        if profiled or not valid_request_id(request_id):
+            request_id = uuid.uuid4().hex
+
+        # Hot queries answered ahead of time for the current index (src/precompute.py)
+        precomputed = answer_store.get(query) if SERVE_PRECOMPUTED else None
+
+        if precomputed:
+            print("⚡ Serving precomputed answer")
+            result = {"final_answer": precomputed["answer"], "tool": precomputed["tool"], "metadata": {}}
+        else:
+            # First request in a lazily started worker waits for the graph
+            if not service.wait(timeout=GRAPH_WAIT_SECONDS):
+                return jsonify({"error": "AI model not initialized"}), 500
+
+            def run_graph():
+                with admission.admit():
+                    return service.invoke(query, deadline)
+
+            if profiled:
+                # Run on its own, not as a follower of a coalesced run, so the profile shows the work
+                with RequestProfiler(request_id):
+                    result = run_graph()
+            else:
+                # Identical queries already in flight share that run (and its admission slot)
+                result = graph_flights.do(normalize_query(query), run_graph)
         answer = result.get("final_answer", "Sorry, I couldn't generate a response.")
 
         print(f"✅ Response generated ({len(answer)} chars)")
@@ -142,17 +268,40 @@ def chat():
             save_message(chat_id, answer, False)
             update_chat_title(chat_id, query)
 
-        return jsonify({
+        response = jsonify({
             "answer": answer,
             "query": query,
             "tool_used": result.get("tool", "unknown"),
-            "chat_id": chat_id
+            "degraded": result.get("metadata", {}).get("degraded"),
+            "precomputed": precomputed is not None,
+            "chat_id": chat_id,
+            "request_id": request_id,
+            "profile": f"/profiles/{request_id}" if profiled and not precomputed else None
         })
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    except Overloaded as e:
+        print(f"⏳ Shed request: {e}")
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = str(max(1, int(e.retry_after)))
+        return response, 503
 
     except Exception as e:
         print(f"❌ Chat error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/profiles/<request_id>', methods=['GET'])
+def get_profile(request_id):
+    """Folded-stack profile of a profiled /chat request (flamegraph.pl / speedscope input)"""
+    if not token_ok(request.headers.get("X-Profile-Token")):
+        return jsonify({"error": "Profile not found"}), 404
+    folded = read_profile(request_id)
+    if folded is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return app.response_class(folded, mimetype="text/plain",
+                              headers={"Content-Disposition": f"inline; filename={request_id}.folded"})
+
 @app.route('/chats', methods=['GET'])
 def get_chats():
     """Get all chat sessions"""
@@ -177,6 +326,83 @@ def get_chats():
         print(f"❌ Get chats error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/chats/search', methods=['GET'])
+def search_chats():
+    """Search all messages; ranked, highlighted, paginated"""
+    try:
+        text = request.args.get('q', '').strip()
+        chat_id = request.args.get('chat_id')
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(100, max(1, request.args.get('per_page', 20, type=int)))
+
+        if not text:
+            return jsonify({"error": "q is required"}), 400
+
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        chat_filter = 'AND m.chat_id = ?' if chat_id else ''
+        chat_args = (chat_id,) if chat_id else ()
+
+        if FTS_ENABLED:
+            match = fts_query(text)
+            cursor.execute(f'''
+                SELECT COUNT(*)
+                FROM messages_fts
+                JOIN messages m ON m.id = messages_fts.rowid
+                WHERE messages_fts MATCH ? {chat_filter}
+            ''', (match, *chat_args))
+            total = cursor.fetchone()[0]
+
+            cursor.execute(f'''
+                SELECT m.id, m.chat_id, c.title, m.is_user, m.created_at,
+                       snippet(messages_fts, 0, ?, ?, '…', 16) AS snippet,
+                       bm25(messages_fts) AS score
+                FROM messages_fts
+                JOIN messages m ON m.id = messages_fts.rowid
+                JOIN chats c ON c.id = m.chat_id
+                WHERE messages_fts MATCH ? {chat_filter}
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            ''', (MARK_START, MARK_END, match, *chat_args, per_page, (page - 1) * per_page))
+        else:
+            pattern = f"%{text}%"
+            cursor.execute(f'''
+                SELECT COUNT(*) FROM messages m WHERE m.message LIKE ? {chat_filter}
+            ''', (pattern, *chat_args))
+            total = cursor.fetchone()[0]
+
+            cursor.execute(f'''
+                SELECT m.id, m.chat_id, c.title, m.is_user, m.created_at,
+                       substr(m.message, 1, 200) AS snippet, NULL AS score
+                FROM messages m
+                JOIN chats c ON c.id = m.chat_id
+                WHERE m.message LIKE ? {chat_filter}
+                ORDER BY m.created_at DESC
+                LIMIT ? OFFSET ?
+            ''', (pattern, *chat_args, per_page, (page - 1) * per_page))
+
+        results = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        # Messages hold user input and LLM output; the snippet is HTML, so escape it
+        for result in results:
+            result['snippet'] = highlight_snippet(result['snippet'])
+
+        return jsonify({
+            "query": text,
+            "results": results,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "has_more": page * per_page < total
+        })
+
+    except Exception as e:
+        print(f"❌ Search error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/chats/<chat_id>', methods=['GET'])
 def get_chat(chat_id):
     """Get specific chat with messages"""